@@ -0,0 +1,30 @@
+"""users email lower index
+
+Revision ID: 9f3c2a7d41be
+Revises: 5cbd6eb609d5
+Create Date: 2026-10-14 19:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9f3c2a7d41be'
+down_revision = '5cbd6eb609d5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Case-insensitive unique email; fails if emails differing only by case exist
+    op.create_index('ix_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    # Redundant with the primary key index
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.drop_index('ix_users_email_lower', table_name='users')
@@ -15,6 +15,9 @@ ROLE_GUEST = 'guest'
 API_PREFIX = "/api"
 API_V1_PREFIX = f"{API_PREFIX}/v1"
 
+# Liveness/readiness probe paths (served without request logging)
+HEALTH_CHECK_PATHS = ("/health", "/health/db")
+
 # Cache TTL values (in seconds)
 CACHE_TTL_SHORT = 60 * 5  # 5 minutes
 CACHE_TTL_MEDIUM = 60 * 30  # 30 minutes
@@ -1,15 +1,22 @@
 
 import os
+import asyncio
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import StaticPool
 
 from app.config.settings import settings
+from app.utils.logger import get_logger
+
+logger = get_logger("database")
 
 
 # Create a Base class for declarative models
 Base = declarative_base()
 
 
+@lru_cache(maxsize=1)
 def get_database_url():
     """Get the appropriate database URL based on environment."""
     if os.getenv("APP_ENV") == "test":
@@ -20,29 +27,84 @@ def get_database_url():
         return str(settings.DATABASE_URL)
 
 
+# Resolved once at import; the URL can't change for the lifetime of the engine
+DB_URL = get_database_url()
+IS_SQLITE = DB_URL.startswith("sqlite")
+
+
+def get_engine_options():
+    """Get connection pool options for the async engine."""
+    if IS_SQLITE:
+        # SQLite-specific settings for testing. StaticPool (what aiosqlite
+        # picks for in-memory URLs anyway) keeps one connection open: the
+        # shared in-memory database only lives while a connection is open,
+        # so NullPool would drop it between sessions. No pre-ping.
+        return {
+            "connect_args": {"check_same_thread": False},
+            "poolclass": StaticPool,
+        }
+    return {
+        # Stale connections are handled by pool_recycle; pre-ping is opt-in
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        # Reuse the most recently returned connection so hot connections stay hot
+        "pool_use_lifo": True,
+    }
+
+
 # Create the SQLAlchemy async engine
 engine = create_async_engine(
-    get_database_url(),
+    DB_URL,
     echo=settings.DB_ECHO,
-    pool_pre_ping=True,
-    # SQLite-specific settings for testing
-    connect_args={"check_same_thread": False} if "sqlite" in get_database_url() else {}
+    **get_engine_options()
 )
 
 
 # Create an async SessionLocal class
+# expire_on_commit=False: objects returned from a write (e.g. via RETURNING)
+# stay readable after commit without an implicit lazy load, which AsyncSession
+# can't do
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
-    class_=AsyncSession
+    class_=AsyncSession,
+    expire_on_commit=False
 )
 
 
+async def warm_up_pool():
+    """
+    Open DB_POOL_SIZE connections and return them to the pool,
+    so the first requests after boot don't pay for connection setup.
+    """
+    if IS_SQLITE:
+        return
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(settings.DB_POOL_SIZE)),
+        return_exceptions=True
+    )
+    connections = [r for r in results if not isinstance(r, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in connections))
+    
+    if len(connections) < len(results):
+        error = next(r for r in results if isinstance(r, BaseException))
+        logger.error(f"Failed to warm up database pool: {str(error)}")
+    else:
+        logger.info(f"Database pool warmed up with {len(connections)} connections")
+
+
 # Async dependency to get DB session
 async def get_db():
+    """
+    Yield one session per request.
+    
+    FastAPI caches the dependency, so every Depends(get_db) in a request
+    shares this session; exiting the context closes it and returns its
+    connection to the pool.
+    """
     async with SessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
\ No newline at end of file
+        yield session
@@ -1,22 +1,34 @@
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 from app.config.settings import settings
+from app.config.constants import HEALTH_CHECK_PATHS
 from app.middlewares.logging_middleware import LoggingMiddleware
-from app.middlewares.context_middleware import RequestContextMiddleware
+from app.middlewares.body_size_middleware import BodySizeLimitMiddleware
+
+# Room for the multipart boundaries and part headers around an upload
+_MULTIPART_OVERHEAD = 64 * 1024
 
 def setup_middlewares(app: FastAPI) -> None:
     """Setup all middleware for the application"""
-    # CORS middleware
+    # Note: the middleware added last wraps all the others (runs first)
+    
+    # Add other middlewares here
+    # Oversized bodies are refused before they are read (inside logging, so
+    # rejections are still logged with their request ID)
+    app.add_middleware(BodySizeLimitMiddleware, max_body_size=settings.MAX_UPLOAD_SIZE + _MULTIPART_OVERHEAD)
+    
+    # LoggingMiddleware also sets the request ID context var for the request.
+    # Health probes are high-frequency and skip it entirely.
+    app.add_middleware(LoggingMiddleware, exclude_paths=HEALTH_CHECK_PATHS)
+    
+    # CORS middleware, outermost so disallowed preflights are answered
+    # before any other work is done
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],  # In production, replace with specific origins
+        allow_origins=settings.cors_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
     
-    # Add other middlewares here
-    app.add_middleware(LoggingMiddleware)
-    app.add_middleware(RequestContextMiddleware)
-    
     return None
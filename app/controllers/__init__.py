@@ -1,17 +1,28 @@
 from fastapi import APIRouter
 from app.config.constants import API_V1_PREFIX
-from app.controllers import (
-    auth_controller,
-    user_controller,
-    health_controller,
-    upload_controller,
-)
+from app.config.settings import settings
 
-# Main API router
-api_router = APIRouter()
 
-# Include sub-routers
-api_router.include_router(health_controller.router, tags=["Health"])
-api_router.include_router(auth_controller.router, prefix=f"{API_V1_PREFIX}/auth", tags=["Authentication"])
-api_router.include_router(user_controller.router, prefix=f"{API_V1_PREFIX}/users", tags=["Users"])
-api_router.include_router(upload_controller.router, prefix=f"{API_V1_PREFIX}/upload", tags=["File Upload"])
+def build_api_router() -> APIRouter:
+    """
+    Build the main API router.
+    
+    Controller modules are imported here rather than at package import time,
+    so importing app.controllers stays cheap and the S3 stack (boto3) is only
+    loaded when uploads are enabled.
+    """
+    from app.controllers import auth_controller, user_controller, health_controller
+    
+    # Main API router
+    api_router = APIRouter()
+    
+    # Include sub-routers
+    api_router.include_router(health_controller.router, tags=["Health"])
+    api_router.include_router(auth_controller.router, prefix=f"{API_V1_PREFIX}/auth", tags=["Authentication"])
+    api_router.include_router(user_controller.router, prefix=f"{API_V1_PREFIX}/users", tags=["Users"])
+    
+    if settings.S3_ENABLED:
+        from app.controllers import upload_controller
+        api_router.include_router(upload_controller.router, prefix=f"{API_V1_PREFIX}/upload", tags=["File Upload"])
+    
+    return api_router
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
@@ -6,13 +7,15 @@ from datetime import timedelta
 from app.config.database import get_db
 from app.services.user_service import user_service
 from app.schemas.base_schema import DataResponse
-from app.utils.auth import create_access_token
+from app.utils.auth import create_access_token, get_token_claims
 from app.utils.tracing import get_trace_logger
 from app.config.settings import settings
 
 router = APIRouter()
 logger = get_trace_logger("auth-controller")
 
+TOKEN_TYPE = "bearer"
+
 @router.post("/token")
 async def login_for_access_token(
     request: Request,
@@ -22,9 +25,6 @@ async def login_for_access_token(
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    # The logger already has the request ID from our middleware
-    auth_logger = get_trace_logger("auth-controller")
-    
     # Authenticate user
     user = await user_service.authenticate_user(
         db=db, 
@@ -33,7 +33,7 @@ async def login_for_access_token(
     )
     
     if not user:
-        auth_logger.warning(f"Failed login attempt for user: {form_data.username}")
+        logger.warning(f"Failed login attempt for user: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -42,7 +42,7 @@ async def login_for_access_token(
     
     # Check if user is active
     if not user.is_active:
-        auth_logger.warning(f"Login attempt for inactive user: {form_data.username}")
+        logger.warning(f"Login attempt for inactive user: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Inactive user",
@@ -52,16 +52,17 @@ async def login_for_access_token(
     # Create access token
     access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.username}, 
+        data=get_token_claims(user), 
         expires_delta=access_token_expires
     )
     
-    auth_logger.info(f"User {form_data.username} logged in successfully")
+    logger.info("User {} logged in successfully", form_data.username)
     
-    return {
+    # Returned as a response directly to skip FastAPI's response encoding
+    return ORJSONResponse({
         "access_token": access_token,
-        "token_type": "bearer"
-    }
+        "token_type": TOKEN_TYPE
+    })
 
 @router.post("/register")
 async def register(
@@ -72,9 +73,6 @@ async def register(
     """
     Register a new user
     """
-    # The logger already has the request ID from our middleware
-    auth_logger = get_trace_logger("auth-controller")
-    
     try:
         # Create user
         user = await user_service.create_user(
@@ -87,25 +85,25 @@ async def register(
         # Create access token
         access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
-            data={"sub": user.username}, 
+            data=get_token_claims(user), 
             expires_delta=access_token_expires
         )
         
-        auth_logger.info(f"User {form_data.username} registered successfully")
+        logger.info("User {} registered successfully", form_data.username)
         
-        return {
+        return ORJSONResponse({
             "access_token": access_token,
-            "token_type": "bearer"
-        }
+            "token_type": TOKEN_TYPE
+        })
         
     except ValueError as e:
-        auth_logger.warning(f"Registration failed: {str(e)}")
+        logger.warning(f"Registration failed: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        auth_logger.error(f"Error during registration: {str(e)}")
+        logger.error(f"Error during registration: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred"
@@ -1,12 +1,57 @@
+import time
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from app.config.database import get_db
+from app.config.settings import settings
 from app.utils.logger import get_logger
 
 router = APIRouter()
 logger = get_logger("health-controller")
 
+# Built once and reused by every database probe
+_HEALTH_STMT = text("SELECT 1")
+
+class DatabaseProbe:
+    """
+    Database connectivity check whose result is reused for HEALTH_DB_CACHE_TTL
+    
+    Orchestrators poll at high frequency; within the TTL they get the last
+    result (healthy or not) instead of a new round trip, so a recovery or an
+    outage shows up at most HEALTH_DB_CACHE_TTL seconds late.
+    """
+    
+    def __init__(self):
+        self._error: Optional[str] = None
+        self._expires_at = 0.0
+    
+    async def check(self, db: AsyncSession) -> Optional[str]:
+        """
+        Probe the database unless the last result is still fresh
+        
+        Args:
+            db: Database session
+            
+        Returns:
+            Error message, or None if the database is healthy
+        """
+        if self._expires_at > time.monotonic():
+            return self._error
+        
+        error = None
+        try:
+            # Execute a simple query to check DB connection
+            await db.execute(_HEALTH_STMT)
+        except Exception as e:
+            logger.error(f"Database health check failed: {str(e)}")
+            error = str(e)
+        self._error = error
+        self._expires_at = time.monotonic() + settings.HEALTH_DB_CACHE_TTL
+        return error
+
+db_probe = DatabaseProbe()
+
 @router.get("/health")
 def health_check():
     """
@@ -28,16 +73,14 @@ async def db_health_check(db: AsyncSession = Depends(get_db)):
     Tests the database connection by executing a simple query.
     """
     logger.debug("Database health check called")
-    try:
-        # Execute a simple query to check DB connection
-        result = await db.execute(text("SELECT 1"))
-        return {
-            "status": "ok", 
-            "message": "Database connection is healthy"
-        }
-    except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
+    
+    error = await db_probe.check(db)
+    if error is not None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Database connection failed: {str(e)}"
+            detail=f"Database connection failed: {error}"
         )
+    return {
+        "status": "ok", 
+        "message": "Database connection is healthy"
+    }
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from typing import Optional
 
 from app.services.upload_service import upload_service
 from app.schemas.upload_schema import ImageUploadResponse
 from app.schemas.base_schema import DataResponse
-from app.utils.auth import get_current_active_user
+from app.utils.auth import get_current_active_user, get_current_active_user_light, AuthPrincipal
 from app.models.user import User
 from app.utils.logger import get_logger
 
@@ -30,7 +30,7 @@ async def upload_image(
     Raises:
         HTTPException: If upload fails or file is invalid
     """
-    logger.info(f"Image upload request from user: {current_user.username}, file: {file.filename}")
+    logger.info("Image upload request from user: {}, file: {}", current_user.username, file.filename)
     
     try:
         # Process upload using service layer
@@ -57,7 +57,7 @@ async def upload_image(
 @router.get("/url/{file_key:path}")
 async def get_image_url(
     file_key: str,
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthPrincipal = Depends(get_current_active_user_light)
 ):
     """
     Generate a new presigned URL for an existing file
@@ -69,7 +69,7 @@ async def get_image_url(
     Returns:
         New presigned URL (expiration time configured via environment)
     """
-    logger.debug(f"URL generation request from user: {current_user.username}, file: {file_key}")
+    logger.debug("URL generation request from user: {}, file: {}", current_user.username, file_key)
     
     try:
         # Generate URL using service layer
@@ -78,7 +78,7 @@ async def get_image_url(
             username=current_user.username
         )
         
-        return JSONResponse(content=url_response)
+        return ORJSONResponse(content=url_response)
         
     except HTTPException:
         # Re-raise HTTPExceptions from service layer
@@ -8,7 +8,7 @@ from app.config.database import get_db
 from app.services.user_service import user_service
 from app.schemas.user_schema import UserCreate, UserResponse, UserUpdate
 from app.schemas.base_schema import DataResponse, ListResponse
-from app.utils.auth import create_access_token, get_current_user, get_current_active_user
+from app.utils.auth import create_access_token, get_current_user, get_current_active_user, get_current_active_user_light, AuthPrincipal
 from app.utils.logger import get_logger
 from app.config.settings import settings
 
@@ -50,13 +50,12 @@ async def get_users(
     skip: int = 0, 
     limit: int = 100, 
     db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_active_user)
+    current_user: AuthPrincipal = Depends(get_current_active_user_light)
 ):
     """
     Get all users (requires authentication)
     """
-    users = await user_service.get_all(db, skip=skip, limit=limit)
-    total = await user_service.count(db)
+    users, total = await user_service.get_page(db, skip=skip, limit=limit)
     return ListResponse(
         data=users,
         total=total,
@@ -76,7 +75,7 @@ async def get_current_user_info(current_user: dict = Depends(get_current_active_
 async def get_user(
     user_id: str, 
     db: AsyncSession = Depends(get_db),
-    current_user: dict = Depends(get_current_active_user)
+    current_user: AuthPrincipal = Depends(get_current_active_user_light)
 ):
     """
     Get user by ID (requires authentication)
@@ -108,14 +107,14 @@ async def update_user(
         )
     
     # Check permissions (only self or superuser)
-    if user_id != current_user.id and not current_user.is_superuser:
+    if user.id != current_user.id and not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions"
         )
     
     # Update user
-    updated_user = await user_service.update(db, id=user_id, obj_in=user_in.dict(exclude_unset=True))
+    updated_user = await user_service.update(db, id=user_id, obj_in=user_in)
     return DataResponse(data=updated_user)
 
 @router.delete("/{user_id}", response_model=DataResponse)
@@ -127,14 +126,6 @@ async def delete_user(
     """
     Delete user (requires superuser)
     """
-    # Check if user exists
-    user = await user_service.get_by_id(db, id=user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
     # Check permissions (only superuser)
     if not current_user.is_superuser:
         raise HTTPException(
@@ -142,6 +133,10 @@ async def delete_user(
             detail="Not enough permissions"
         )
     
-    # Delete user
-    await user_service.delete(db, id=user_id)
+    # Delete user; DELETE ... RETURNING tells us whether it existed
+    if not await user_service.delete(db, id=user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
     return DataResponse(message=f"User {user_id} deleted successfully")
@@ -1,7 +1,8 @@
 import os
+import time
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
 from app.utils.logger import get_logger
 from app.config.settings import settings
 from app.jobs import scheduled_jobs  # Import scheduled job definitions
@@ -14,9 +15,10 @@ jobstores = {
 }
 
 # Create executors
+# The scheduler runs in its own process (RUN_SCHEDULER=true), so a thread
+# pool is enough; no process pool is forked next to it
 executors = {
     'default': ThreadPoolExecutor(20),
-    'processpool': ProcessPoolExecutor(5)
 }
 
 # Job defaults
@@ -77,6 +79,12 @@ def start_scheduler():
         logger.info("Testing environment detected, not starting scheduler")
         return
     
+    # Only the dedicated scheduler process runs jobs; API workers skip it so
+    # they don't hold jobstore connections and executor threads
+    if not settings.RUN_SCHEDULER:
+        logger.info("RUN_SCHEDULER is disabled, not starting scheduler")
+        return
+    
     try:
         # Configure jobs
         configure_jobs()
@@ -98,3 +106,12 @@ def stop_scheduler():
         logger.info("Scheduler stopped")
     else:
         logger.warning("Scheduler not running")
+
+if __name__ == "__main__":
+    # Dedicated scheduler process: RUN_SCHEDULER=true python -m app.jobs.scheduler
+    start_scheduler()
+    try:
+        while scheduler.running:
+            time.sleep(1)
+    except (KeyboardInterrupt, SystemExit):
+        stop_scheduler()
@@ -0,0 +1,84 @@
+from fastapi import HTTPException, status
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.logger import get_logger
+
+logger = get_logger("http")
+
+class RequestBodyTooLarge(HTTPException):
+    """
+    Raised from receive() once a streamed body passes the limit.
+
+    An HTTPException, so FastAPI's body parsing re-raises it rather than
+    turning it into a 400; BodySizeLimitMiddleware answers it with 413
+    whichever code was reading the body.
+    """
+
+    def __init__(self, detail: str):
+        super().__init__(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+class BodySizeLimitMiddleware:
+    """
+    Pure ASGI middleware that rejects request bodies over a size limit.
+
+    A declared Content-Length over the limit is answered with 413 before any
+    of the body is read. Bodies without one (chunked) or with a wrong one are
+    counted as they are received, and reading stops with a 413 as soon as the
+    limit is passed, whether the body is read by FastAPI, a route reading
+    Request.stream() or another middleware.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        """
+        Args:
+            app: The downstream ASGI application
+            max_body_size: Largest accepted request body in bytes
+        """
+        self.app = app
+        self.max_body_size = max_body_size
+        self.detail = f"Request body cannot exceed {max_body_size} bytes"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_body_size:
+                    logger.warning(f"Rejected {scope['method']} {scope['path']}: Content-Length {int(value)} over limit")
+                    response = ORJSONResponse(
+                        {"detail": self.detail},
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+                    )
+                    return await response(scope, receive, send)
+                break
+
+        received = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    logger.warning(f"Rejected {scope['method']} {scope['path']}: body over limit")
+                    raise RequestBodyTooLarge(self.detail)
+            return message
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except RequestBodyTooLarge as exc:
+            # Not handled further in: answer it here instead of letting it
+            # become a 500
+            if response_started:
+                raise
+            response = ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code)
+            await response(scope, receive, send)
@@ -1,48 +1,86 @@
 import time
-from fastapi import FastAPI, Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.utils.tracing import get_trace_logger, set_trace_context_from_request, add_trace_headers_to_response
+from typing import Iterable
+from fastapi import FastAPI
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.tracing import get_trace_logger, set_trace_context_from_scope
 
 logger = get_trace_logger("http")
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+# Response header names, pre-encoded for the raw ASGI header list
+_REQUEST_ID_HEADER = b"x-request-id"
+_PROCESS_TIME_HEADER = b"x-process-time"
+
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware that logs each request and stamps tracing headers.
+    
+    It also owns the request context: the request ID is read from the
+    X-Request-ID header (or generated) and set on the context var before
+    the downstream app runs, so services and loggers can pick it up.
+    
+    Implemented without BaseHTTPMiddleware so no Request/Response objects or
+    extra anyio task are created per request.
+    """
+    
+    def __init__(self, app: ASGIApp, exclude_paths: Iterable[str] = ()):
+        """
+        Args:
+            app: The downstream ASGI application
+            exclude_paths: Exact paths passed straight through (e.g. health probes)
+        """
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            return await self.app(scope, receive, send)
+        
         # Set up request tracing context and get the request ID
-        request_id = set_trace_context_from_request(request)
+        request_id = set_trace_context_from_scope(scope)
         
-        # Get logger with request ID from context
-        request_logger = get_trace_logger("http")
+        method = scope["method"]
+        path = scope["path"]
         
-        # Log the request
-        request_logger.info(f"{request.method} {request.url.path}")
+        # Log the request. Arguments are formatted by loguru only if the
+        # record is actually emitted at the configured level.
+        logger.info("{} {}", method, path)
         
         # Process the request and track timing
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        status_code = 500
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = (time.perf_counter_ns() - start_ns) / 1e9
+                
+                # Add trace headers to response in a single list build
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    (_REQUEST_ID_HEADER, request_id.encode("latin-1")),
+                    (_PROCESS_TIME_HEADER, f"{process_time:.4f}".encode("latin-1")),
+                ]
+            await send(message)
         
         try:
             # Process the request
-            response = await call_next(request)
-            process_time = time.time() - start_time
-            
-            # Log the response
-            request_logger.info(
-                f"{request.method} {request.url.path} - "
-                f"Status: {response.status_code} - Time: {process_time:.4f}s"
-            )
-            
-            # Add trace headers to response
-            add_trace_headers_to_response(response, request_id)
-            response.headers["X-Process-Time"] = str(process_time)
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            process_time = time.time() - start_time
-            request_logger.error(
-                f"{request.method} {request.url.path} - "
-                f"Error: {str(e)} - Time: {process_time:.4f}s"
+            process_time = (time.perf_counter_ns() - start_ns) / 1e9
+            logger.error(
+                "{} {} - Error: {} - Time: {:.4f}s",
+                method, path, e, process_time
             )
             raise
+        
+        process_time = (time.perf_counter_ns() - start_ns) / 1e9
+        
+        # Log the response
+        logger.info(
+            "{} {} - Status: {} - Time: {:.4f}s",
+            method, path, status_code, process_time
+        )
 
 def setup_logging_middleware(app: FastAPI):
     """Setup logging middleware for FastAPI app"""
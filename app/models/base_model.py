@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import lru_cache
 from sqlalchemy import Column, String, DateTime, Boolean, Integer
 from sqlalchemy.ext.declarative import declared_attr
 from app.config.database import Base
@@ -13,19 +14,33 @@ class BaseModel(Base):
         return cls.__name__.lower() + 's'
     
     # Common columns for all models
-    id = Column(Integer, primary_key=True, index=True)
+    # The primary key constraint already provides the index
+    id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _column_names(cls):
+        """Column names of the mapped table, resolved once per model class"""
+        return tuple(c.name for c in cls.__table__.columns)
+    
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _column_name_set(cls):
+        """Column names as a frozenset for membership checks"""
+        return frozenset(cls._column_names())
+    
     def to_dict(self):
         """Convert model instance to dictionary"""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        return {name: getattr(self, name) for name in self._column_names()}
     
     @classmethod
     def from_dict(cls, data):
         """Create model instance from dictionary"""
-        return cls(**{k: v for k, v in data.items() if k in cls.__table__.columns.keys()})
+        columns = cls._column_name_set()
+        return cls(**{k: v for k, v in data.items() if k in columns})
     
     def __repr__(self):
         """String representation of the model"""
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, Boolean, Date, Integer, Enum
+from sqlalchemy import Column, String, Boolean, Date, Integer, Enum, Index, func
 from app.models.base_model import BaseModel
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.password import hash_password, verify_password
 import enum
 
 class GenderEnum(str, enum.Enum):
@@ -13,7 +13,8 @@ class User(BaseModel):
     
     # User information
     username = Column(String, unique=True, index=True, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
+    # Uniqueness is enforced case-insensitively by ix_users_email_lower below
+    email = Column(String, nullable=False)
     phone = Column(String, unique=True, index=True, nullable=True)
     gender = Column(Enum(GenderEnum), nullable=False, default=GenderEnum.other)
     full_name = Column(String, nullable=True)
@@ -26,6 +27,11 @@ class User(BaseModel):
     is_active = Column(Boolean, default=True, nullable=False)
     is_superuser = Column(Boolean, default=False, nullable=False)
     
+    __table_args__ = (
+        # Backs get_by_email, which compares on lower(email)
+        Index("ix_users_email_lower", func.lower(email), unique=True),
+    )
+    
     def __init__(self, username, email, password, full_name=None, is_superuser=False, gender=None, token_balance=0):
         """Initialize a new user"""
         self.username = username
@@ -37,12 +43,12 @@ class User(BaseModel):
         self.is_superuser = is_superuser
     
     def set_password(self, password):
-        """Set password hash"""
-        self.hashed_password = generate_password_hash(password)
+        """Set password hash (CPU-bound; async code should hash via asyncio.to_thread)"""
+        self.hashed_password = hash_password(password)
     
     def check_password(self, password):
         """Check password against stored hash"""
-        return check_password_hash(self.hashed_password, password)
+        return verify_password(self.hashed_password, password)
     
     def __repr__(self):
         """String representation"""
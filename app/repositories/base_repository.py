@@ -1,13 +1,26 @@
-from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union
+from functools import lru_cache
+from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from fastapi.encoders import jsonable_encoder
-from app.utils.logger import get_logger
+from sqlalchemy import select, insert, update, delete, func, bindparam, text, Integer
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql import Select
+from app.config.settings import settings
+from app.utils.logger import DEBUG_ENABLED, get_logger
 from app.models.base_model import BaseModel
 
 # Generic type for database models
 ModelType = TypeVar("ModelType", bound=BaseModel)
 
+# Planner row estimate; reltuples is -1 until the table is first vacuumed/analyzed.
+# to_regclass resolves the name through search_path, so a same-named table in
+# another schema can't match; it yields NULL (no row) if the table doesn't exist
+_ESTIMATE_COUNT_STMT = text(
+    "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)"
+)
+
+# Rows per INSERT in create_many; keeps statements well under bind-parameter limits
+BULK_INSERT_CHUNK_SIZE = 500
+
 class BaseRepository(Generic[ModelType]):
     """
     Base repository class with common database operations
@@ -24,6 +37,13 @@ class BaseRepository(Generic[ModelType]):
         """
         self.model = model
         self.logger = get_logger("repository")
+        # Column attributes are fixed per model; resolved once so filters, sorting
+        # and updates do a dict lookup instead of hasattr/getattr per call
+        self._columns = {name: getattr(model, name) for name in model.__table__.columns.keys()}
+        # One statement per (filter columns, sort order, with_total) shape, reused
+        # across calls so SQLAlchemy hits its compiled cache without rebuilding
+        # the Select every time
+        self._list_statement = lru_cache(maxsize=256)(self._build_list_statement)
     
     async def get_by_id(self, db: AsyncSession, id: str) -> Optional[ModelType]:
         """
@@ -46,7 +66,8 @@ class BaseRepository(Generic[ModelType]):
         skip: int = 0, 
         limit: int = 100,
         filter_by: Dict[str, Any] = None,
-        order_by: List[str] = None
+        order_by: List[str] = None,
+        load_related: List[str] = None
     ) -> List[ModelType]:
         """
         Get all records with optional filtering, sorting, and pagination
@@ -57,53 +78,181 @@ class BaseRepository(Generic[ModelType]):
             limit: Maximum number of records to return
             filter_by: Dictionary of filter conditions {column_name: value}
             order_by: List of columns to sort by, prefix with - for descending
+            load_related: Relationships to eager-load with selectinload (avoids N+1)
             
         Returns:
             List of record objects
         """
-        query = select(self.model)
+        stmt, params = self._list_query(filter_by, order_by, skip, limit, load_related=load_related)
+        result = await db.execute(stmt, params)
+        return result.scalars().all()
+    
+    async def get_page(
+        self, 
+        db: AsyncSession, 
+        *, 
+        skip: int = 0, 
+        limit: int = 100,
+        filter_by: Dict[str, Any] = None,
+        order_by: List[str] = None,
+        load_related: List[str] = None
+    ) -> Tuple[List[ModelType], int]:
+        """
+        Get a page of records together with the total count in one query
         
-        # Apply filters if provided
+        The total is computed with COUNT(*) OVER () alongside the rows,
+        so listing endpoints don't need a separate count() round trip.
+        
+        Args:
+            db: Database session
+            skip: Number of records to skip (offset)
+            limit: Maximum number of records to return
+            filter_by: Dictionary of filter conditions {column_name: value}
+            order_by: List of columns to sort by, prefix with - for descending
+            load_related: Relationships to eager-load with selectinload (avoids N+1)
+            
+        Returns:
+            Tuple of (list of record objects, total number of matching records)
+        """
+        stmt, params = self._list_query(
+            filter_by, order_by, skip, limit, with_total=True, load_related=load_related
+        )
+        result = await db.execute(stmt, params)
+        rows = result.all()
+        
+        if not rows:
+            # Past the last page there is no row to carry the total
+            total = 0 if skip == 0 else await self.count(db, filter_by=filter_by)
+            return [], total
+        
+        return [row[0] for row in rows], rows[0][1]
+    
+    def _list_query(
+        self,
+        filter_by: Optional[Dict[str, Any]],
+        order_by: Optional[List[str]],
+        skip: int,
+        limit: int,
+        with_total: bool = False,
+        load_related: Optional[List[str]] = None
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """
+        Resolve the cached list statement for the given options and its parameters
+        
+        Args:
+            filter_by: Dictionary of filter conditions {column_name: value}
+            order_by: List of columns to sort by, prefix with - for descending
+            skip: Number of records to skip (offset)
+            limit: Maximum number of records to return
+            with_total: Also select COUNT(*) OVER () as "total"
+            load_related: Relationships to eager-load with selectinload
+            
+        Returns:
+            Tuple of (select statement, bind parameters)
+        """
+        filters = {}
         if filter_by:
-            for column, value in filter_by.items():
-                if hasattr(self.model, column):
-                    query = query.filter(getattr(self.model, column) == value)
-        
-        # Apply sorting if provided
-        if order_by:
-            for column in order_by:
-                if column.startswith("-"):
-                    # Descending order
-                    query = query.order_by(getattr(self.model, column[1:]).desc())
-                else:
-                    # Ascending order
-                    query = query.order_by(getattr(self.model, column).asc())
-        
-        # Apply pagination
-        query = query.offset(skip).limit(limit)
+            # Unknown columns are ignored, as before; sorting the keys keeps
+            # {"a", "b"} and {"b", "a"} on the same statement
+            filters = {
+                column: filter_by[column]
+                for column in sorted(filter_by)
+                if column in self._columns
+            }
         
-        result = await db.execute(query)
-        return result.scalars().all()
+        # None means IS NULL, which can't be a bound "= :value"; those columns
+        # are part of the statement shape instead of its parameters
+        null_columns = tuple(column for column, value in filters.items() if value is None)
+        value_filters = {column: value for column, value in filters.items() if value is not None}
+        
+        stmt = self._list_statement(
+            tuple(value_filters), tuple(order_by or ()), with_total,
+            tuple(load_related or ()), null_columns
+        )
+        params = {f"filter_{column}": value for column, value in value_filters.items()}
+        params["skip"] = skip
+        params["limit"] = limit
+        return stmt, params
+    
+    def _build_list_statement(
+        self,
+        filter_columns: Tuple[str, ...],
+        order_by: Tuple[str, ...],
+        with_total: bool,
+        load_related: Tuple[str, ...] = (),
+        null_columns: Tuple[str, ...] = ()
+    ) -> Select:
+        """
+        Build a list statement with filter values, offset and limit as bind parameters
+        
+        Args:
+            filter_columns: Sorted names of the columns to compare with a bound value
+            order_by: Columns to sort by, prefix with - for descending
+            with_total: Also select COUNT(*) OVER () as "total"
+            load_related: Relationships to eager-load with selectinload
+            null_columns: Sorted names of the columns that must be NULL
+            
+        Returns:
+            The select statement
+            
+        Raises:
+            ValueError: If a name in load_related is not a relationship of the model
+        """
+        if with_total:
+            query = select(self.model, func.count().over().label("total"))
+        else:
+            query = select(self.model)
+        
+        for column in filter_columns:
+            query = query.filter(self._columns[column] == bindparam(f"filter_{column}"))
+        
+        for column in null_columns:
+            query = query.filter(self._columns[column].is_(None))
+        
+        for column in order_by:
+            descending = column.startswith("-")
+            attr = self._columns.get(column[1:] if descending else column)
+            if attr is None:
+                # Unknown columns are ignored, like in filter_by
+                continue
+            query = query.order_by(attr.desc() if descending else attr.asc())
+        
+        for name in load_related:
+            relationship = self.model.__mapper__.relationships.get(name)
+            if relationship is None:
+                raise ValueError(f"{self.model.__name__} has no relationship {name!r}")
+            query = query.options(selectinload(getattr(self.model, name)))
+        
+        return query.offset(bindparam("skip", type_=Integer)).limit(bindparam("limit", type_=Integer))
     
     async def count(self, db: AsyncSession, filter_by: Dict[str, Any] = None) -> int:
         """
         Count records with optional filtering
         
+        With DB_EXACT_COUNT disabled, unfiltered counts on PostgreSQL come from
+        the planner's row estimate instead of a full table scan.
+        
         Args:
             db: Database session
             filter_by: Dictionary of filter conditions {column_name: value}
             
         Returns:
-            Count of records
+            Count of records (approximate when estimated)
         """
-        from sqlalchemy import func
+        if not filter_by and not settings.DB_EXACT_COUNT and db.get_bind().dialect.name == "postgresql":
+            result = await db.execute(_ESTIMATE_COUNT_STMT, {"table_name": self.model.__table__.fullname})
+            estimate = result.scalar_one_or_none()
+            if estimate is not None and estimate >= 0:
+                return estimate
+        
         query = select(func.count()).select_from(self.model)
         
         # Apply filters if provided
         if filter_by:
-            for column, value in filter_by.items():
-                if hasattr(self.model, column):
-                    query = query.filter(getattr(self.model, column) == value)
+            for column, value in sorted(filter_by.items()):
+                attr = self._columns.get(column)
+                if attr is not None:
+                    query = query.filter(attr == value)
         
         result = await db.execute(query)
         return result.scalar_one()
@@ -121,15 +270,49 @@ class BaseRepository(Generic[ModelType]):
         """
         obj_data = obj_in
         if not isinstance(obj_in, dict):
-            obj_data = jsonable_encoder(obj_in)
-          
+            # Python mode keeps date/datetime/enum values as-is for the columns
+            obj_data = obj_in.model_dump()
+        
         db_obj = self.model(**obj_data)
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
-        self.logger.debug(f"Created {self.model.__name__} with id: {db_obj.id}")
+        if DEBUG_ENABLED:
+            self.logger.debug("Created {} with id: {}", self.model.__name__, db_obj.id)
         return db_obj
     
+    async def create_many(
+        self, 
+        db: AsyncSession, 
+        *, 
+        objs_in: List[Dict[str, Any]]
+    ) -> List[ModelType]:
+        """
+        Create many records in one transaction with bulk INSERT ... RETURNING
+        
+        Rows are inserted in chunks of BULK_INSERT_CHUNK_SIZE. The model's
+        __init__ is not called, so each dict must hold final column values
+        (e.g. hashed_password, not password).
+        
+        Args:
+            db: Database session
+            objs_in: List of column dictionaries
+            
+        Returns:
+            Created record objects, in input order
+        """
+        if not objs_in:
+            return []
+        
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        created = []
+        for start in range(0, len(objs_in), BULK_INSERT_CHUNK_SIZE):
+            result = await db.execute(stmt, objs_in[start:start + BULK_INSERT_CHUNK_SIZE])
+            created.extend(result.scalars().all())
+        await db.commit()
+        if DEBUG_ENABLED:
+            self.logger.debug("Created {} {} records", len(created), self.model.__name__)
+        return created
+    
     async def update(
         self, 
         db: AsyncSession, 
@@ -143,62 +326,115 @@ class BaseRepository(Generic[ModelType]):
         Args:
             db: Database session
             db_obj: Existing database object to update
-            obj_in: New data, can be a dict or model instance
+            obj_in: New data, can be a dict or Pydantic schema (only set fields are applied)
             
         Returns:
             Updated record object
         """
-        obj_data = jsonable_encoder(db_obj)
         update_data = obj_in
         
         if not isinstance(obj_in, dict):
-            update_data = jsonable_encoder(obj_in)
+            # Only the fields the client actually sent, without re-validating
+            update_data = {name: getattr(obj_in, name) for name in obj_in.model_fields_set}
             
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        for field, value in update_data.items():
+            if field in self._columns:
+                setattr(db_obj, field, value)
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
-        self.logger.debug(f"Updated {self.model.__name__} with id: {db_obj.id}")
+        if DEBUG_ENABLED:
+            self.logger.debug("Updated {} with id: {}", self.model.__name__, db_obj.id)
         return db_obj
     
-    async def delete(self, db: AsyncSession, *, id: str) -> ModelType:
+    async def update_by_id(
+        self, 
+        db: AsyncSession, 
+        *, 
+        id: str, 
+        obj_in: Union[Dict[str, Any], ModelType]
+    ) -> Optional[ModelType]:
+        """
+        Update a record by id in a single UPDATE ... RETURNING statement
+        
+        Args:
+            db: Database session
+            id: Record ID
+            obj_in: New data, can be a dict or Pydantic schema (only set fields are applied)
+            
+        Returns:
+            Updated record object or None if not found
+        """
+        update_data = obj_in
+        
+        if not isinstance(obj_in, dict):
+            update_data = {name: getattr(obj_in, name) for name in obj_in.model_fields_set}
+        
+        values = {
+            field: value for field, value in update_data.items() if field in self._columns
+        }
+        if not values:
+            # Nothing to change; UPDATE needs at least one column
+            return await self.get_by_id(db, id=id)
+        
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(stmt)
+        obj = result.scalar_one_or_none()
+        await db.commit()
+        if obj is not None and DEBUG_ENABLED:
+            self.logger.debug("Updated {} with id: {}", self.model.__name__, id)
+        return obj
+    
+    async def delete(self, db: AsyncSession, *, id: str) -> Optional[ModelType]:
         """
-        Delete a record
+        Delete a record in a single DELETE ... RETURNING statement
         
         Args:
             db: Database session
             id: Record ID
             
         Returns:
-            Deleted record object
-        """        
-        result = await db.execute(select(self.model).filter(self.model.id == id))
+            Deleted record object or None if not found
+        """
+        stmt = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(stmt)
         obj = result.scalar_one_or_none()
-        if obj is not None:
-            await db.delete(obj)
-            await db.commit()
-            self.logger.debug(f"Deleted {self.model.__name__} with id: {id}")
+        await db.commit()
+        if obj is not None and DEBUG_ENABLED:
+            self.logger.debug("Deleted {} with id: {}", self.model.__name__, id)
         return obj
     
-    async def soft_delete(self, db: AsyncSession, *, id: str) -> ModelType:
+    async def soft_delete(self, db: AsyncSession, *, id: str) -> Optional[ModelType]:
         """
-        Soft delete a record (mark as inactive)
+        Soft delete a record (mark as inactive) in a single UPDATE ... RETURNING statement
         
         Args:
             db: Database session
             id: Record ID
             
         Returns:
-            Updated record object
+            Updated record object or None if not found
         """
-        result = await db.execute(select(self.model).filter(self.model.id == id))
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(is_active=False)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(stmt)
         obj = result.scalar_one_or_none()
-        if obj is not None:
-            obj.is_active = False
-            db.add(obj)
-            await db.commit()
-            await db.refresh(obj)
-            self.logger.debug(f"Soft deleted {self.model.__name__} with id: {id}")
+        await db.commit()
+        if obj is not None and DEBUG_ENABLED:
+            self.logger.debug("Soft deleted {} with id: {}", self.model.__name__, id)
         return obj
@@ -1,39 +1,199 @@
+import asyncio
+import time
 from app.repositories.base_repository import BaseRepository
 from app.models.user import GenderEnum, User
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import Optional
+from sqlalchemy import select, func, or_, bindparam
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import Any, Dict, Optional, Tuple, Union
+from app.config.settings import settings
+from app.utils.password import hash_password
+
+# Upper bound on cached user rows; the oldest entry is evicted first
+_USER_CACHE_MAXSIZE = 10_000
+
+# Auth-path lookups, built once with bound values so each call reuses the
+# same statement object (and its compiled form) instead of rebuilding it
+_GET_BY_EMAIL_STMT = select(User).where(func.lower(User.email) == bindparam("email"))
+_GET_BY_USERNAME_STMT = select(User).where(User.username == bindparam("username"))
+
+# Never served from the cache: re-read by primary key on every hit, so
+# password changes, deactivation, demotion and renames made anywhere (other
+# workers, Celery, scripts, raw SQL) apply at once
+_ACCOUNT_FIELDS = ("username", "email", "hashed_password", "is_active", "is_superuser")
+_GET_ACCOUNT_STMT = (
+    select(*(getattr(User, name) for name in _ACCOUNT_FIELDS))
+    .where(User.id == bindparam("id"))
+)
+
+def _dialect_insert(db: AsyncSession):
+    """insert() construct with ON CONFLICT support for the session's database"""
+    return sqlite_insert if db.get_bind().dialect.name == "sqlite" else pg_insert
 
 class UserRepository(BaseRepository[User]):
     """Repository for User model"""
     
     def __init__(self):
         super().__init__(User)
+        # ("email", lower(email)) / ("username", username) -> (column values
+        # without _ACCOUNT_FIELDS, expiry)
+        self._cache = {}
     
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
-        """Get user by email"""
-        result = await db.execute(select(User).filter(User.email == email))
-        return result.scalar_one_or_none()
+        """Get user by email (case-insensitive), using the short-lived cache for profile columns"""
+        key = ("email", email.lower())
+        user = await self._get_cached(db, key)
+        if user is None:
+            result = await db.execute(_GET_BY_EMAIL_STMT, {"email": key[1]})
+            user = result.scalar_one_or_none()
+            self._store(key, user)
+        return user
     
     async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
-        """Get user by username"""
-        result = await db.execute(select(User).filter(User.username == username))
-        return result.scalar_one_or_none()
-
-    async def create_user(self, db: AsyncSession, username: str, email: str, password: str, full_name: str = None, is_superuser: bool = False, gender: GenderEnum = GenderEnum.other) -> User:
-        """Create a new user"""
-        user = User(
-            username=username,
-            email=email,
-            password=password,
-            full_name=full_name,
-            is_superuser=is_superuser,
-            gender=gender,
-            token_balance=0  # Default token balance
+        """Get user by username, using the short-lived cache for profile columns"""
+        key = ("username", username)
+        user = await self._get_cached(db, key)
+        if user is None:
+            result = await db.execute(_GET_BY_USERNAME_STMT, {"username": username})
+            user = result.scalar_one_or_none()
+            self._store(key, user)
+        return user
+    
+    async def _get_cached(self, db: AsyncSession, key: Tuple[str, str]) -> Optional[User]:
+        """
+        Rebuild a cached user with its account columns freshly read
+        
+        Returns None (and drops the entry) on a miss, an expired entry, or
+        when the user was deleted or no longer matches key. Each hit gets its
+        own instance, so requests never share ORM objects.
+        """
+        cached = self._cache.get(key)
+        if cached is None:
+            return None
+        values, expires_at = cached
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        
+        result = await db.execute(_GET_ACCOUNT_STMT, {"id": values["id"]})
+        row = result.one_or_none()
+        if row is None or key not in self._keys(row):
+            self._cache.pop(key, None)
+            return None
+        
+        user = User.__mapper__.class_manager.new_instance()
+        for name, value in values.items():
+            setattr(user, name, value)
+        for name, value in zip(_ACCOUNT_FIELDS, row):
+            setattr(user, name, value)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+    
+    def _store(self, key: Tuple[str, str], user: Optional[User]) -> None:
+        """Cache a user's profile columns under key (misses aren't cached)"""
+        if user is None or settings.USER_CACHE_TTL <= 0:
+            return
+        self._cache.pop(key, None)
+        if len(self._cache) >= _USER_CACHE_MAXSIZE:
+            del self._cache[next(iter(self._cache))]
+        values = {name: value for name, value in user.to_dict().items() if name not in _ACCOUNT_FIELDS}
+        self._cache[key] = (values, time.monotonic() + settings.USER_CACHE_TTL)
+    
+    @staticmethod
+    def _keys(user) -> Tuple[Tuple[str, str], Tuple[str, str]]:
+        """Cache keys of a user (or of a row with username and email)"""
+        return ("email", user.email.lower()), ("username", user.username)
+    
+    def _invalidate(self, *users: Optional[User]) -> None:
+        """Drop the cache entries of the given users"""
+        for user in users:
+            if user is not None:
+                for key in self._keys(user):
+                    self._cache.pop(key, None)
+    
+    async def update(self, db: AsyncSession, *, db_obj: User, obj_in: Union[Dict[str, Any], User]) -> User:
+        """Update a user and drop it from the cache, under its old and new keys"""
+        old_keys = self._keys(db_obj)
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        for key in old_keys:
+            self._cache.pop(key, None)
+        self._invalidate(user)
+        return user
+    
+    async def update_by_id(self, db: AsyncSession, *, id: Any, obj_in: Union[Dict[str, Any], User]) -> Optional[User]:
+        """Update a user by id and drop it from the cache"""
+        user = await super().update_by_id(db, id=id, obj_in=obj_in)
+        self._invalidate(user)
+        return user
+    
+    async def delete(self, db: AsyncSession, *, id: Any) -> Optional[User]:
+        """Delete a user and drop it from the cache"""
+        user = await super().delete(db, id=id)
+        self._invalidate(user)
+        return user
+    
+    async def soft_delete(self, db: AsyncSession, *, id: Any) -> Optional[User]:
+        """Soft delete a user and drop it from the cache"""
+        user = await super().soft_delete(db, id=id)
+        self._invalidate(user)
+        return user
+
+    async def exists_by_email_or_username(self, db: AsyncSession, email: str, username: str) -> Tuple[bool, bool]:
+        """
+        Check whether an email (case-insensitive) or username is taken, in one query
+        
+        Returns:
+            Tuple of (email taken, username taken)
+        """
+        result = await db.execute(
+            select(User.email, User.username)
+            .filter(or_(func.lower(User.email) == email.lower(), User.username == username))
+            .limit(2)
+        )
+        rows = result.all()
+        email_taken = any(row.email.lower() == email.lower() for row in rows)
+        username_taken = any(row.username == username for row in rows)
+        return email_taken, username_taken
+
+    async def get_account_status(self, db: AsyncSession, id: int) -> Optional[Tuple[bool, bool]]:
+        """Get (is_active, is_superuser) for a user id, without loading the row"""
+        result = await db.execute(
+            select(User.is_active, User.is_superuser).filter(User.id == id)
+        )
+        row = result.one_or_none()
+        return tuple(row) if row is not None else None
+
+    async def create_user(self, db: AsyncSession, username: str, email: str, password: str, full_name: str = None, is_superuser: bool = False, gender: GenderEnum = GenderEnum.other) -> Optional[User]:
+        """
+        Create a new user in a single INSERT ... ON CONFLICT DO NOTHING RETURNING
+        
+        Returns None instead of raising when the username, email or phone is
+        already taken, so callers don't need a SELECT before inserting.
+        """
+        # Argon2 is deliberately CPU-expensive; hash off the event loop
+        hashed_password = await asyncio.to_thread(hash_password, password)
+        values = {
+            "username": username,
+            "email": email,
+            "hashed_password": hashed_password,
+            "full_name": full_name,
+            "is_superuser": is_superuser,
+            "token_balance": 0,  # Default token balance
+        }
+        if gender is not None:
+            values["gender"] = gender
+        
+        stmt = (
+            _dialect_insert(db)(User)
+            .values(**values)
+            .on_conflict_do_nothing()
+            .returning(User)
         )
-        db.add(user)
+        result = await db.execute(stmt)
+        user = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(user)
         return user
 
 # Create instance for dependency injection
@@ -1,6 +1,32 @@
+import re
 from typing import Optional, BinaryIO
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from fastapi import UploadFile, HTTPException, status
+from app.config.settings import settings
+
+# Path separators, parent references and characters not allowed in filenames
+_FORBIDDEN_FILENAME_RE = re.compile(r'[/\\<>:"|?*]|\.\.')
+
+ALLOWED_IMAGE_TYPES = frozenset({
+    'image/jpeg', 'image/jpg', 'image/png',
+    'image/gif', 'image/webp', 'image/bmp'
+})
+_ALLOWED_IMAGE_TYPES_STR = ", ".join(sorted(ALLOWED_IMAGE_TYPES))
+
+MAX_FILE_SIZE = settings.MAX_UPLOAD_SIZE
+
+def content_type_error(content_type: Optional[str]) -> Optional[str]:
+    """
+    Check a MIME type against the image allowlist with a set lookup
+    
+    Returns:
+        The validation error message, or None if the type is allowed
+    """
+    if content_type in ALLOWED_IMAGE_TYPES:
+        return None
+    if not content_type or not content_type.startswith('image/'):
+        return 'Only image files are allowed'
+    return f'Supported image types: {_ALLOWED_IMAGE_TYPES_STR}'
 
 class ImageUploadResponse(BaseModel):
     """Schema for image upload response"""
@@ -14,48 +40,44 @@ class ImageUploadResponse(BaseModel):
 
 class FileValidationRequest(BaseModel):
     """Schema for file validation data"""
+    model_config = ConfigDict(frozen=True)
+    
     filename: str = Field(..., min_length=1, max_length=255, description="Original filename")
     content_type: str = Field(..., description="MIME type of the file")
     file_size: int = Field(..., gt=0, description="File size in bytes")
     
-    @validator('filename')
+    @field_validator('filename')
+    @classmethod
     def validate_filename(cls, v):
         """Validate filename for security"""
         if not v or not v.strip():
             raise ValueError('Filename cannot be empty')
         
-        # Check for dangerous characters
-        dangerous_chars = ['/', '\\', '..', '<', '>', ':', '"', '|', '?', '*']
-        for char in dangerous_chars:
-            if char in v:
-                raise ValueError(f'Filename contains invalid character: {char}')
+        # Check for dangerous characters in a single pass
+        match = _FORBIDDEN_FILENAME_RE.search(v)
+        if match:
+            raise ValueError(f'Filename contains invalid character: {match.group()}')
         
         return v.strip()
     
-    @validator('content_type')
+    @field_validator('content_type')
+    @classmethod
     def validate_content_type(cls, v):
         """Validate that content type is for images"""
-        if not v or not v.startswith('image/'):
-            raise ValueError('Only image files are allowed')
-        
-        allowed_types = [
-            'image/jpeg', 'image/jpg', 'image/png', 
-            'image/gif', 'image/webp', 'image/bmp'
-        ]
-        
-        if v not in allowed_types:
-            raise ValueError(f'Supported image types: {", ".join(allowed_types)}')
+        error = content_type_error(v)
+        if error:
+            raise ValueError(error)
         
         return v
     
-    @validator('file_size')
+    @field_validator('file_size')
+    @classmethod
     def validate_file_size(cls, v):
-        """Validate file size (max 10MB)"""
+        """Validate file size (max MAX_FILE_SIZE)"""
         if v <= 0:
             raise ValueError('File cannot be empty')
         
-        max_size = 10 * 1024 * 1024  # 10MB
-        if v > max_size:
-            raise ValueError(f'File size cannot exceed {max_size} bytes (10MB)')
+        if v > MAX_FILE_SIZE:
+            raise ValueError(f'File size cannot exceed {MAX_FILE_SIZE} bytes ({MAX_FILE_SIZE / (1024 * 1024):g}MB)')
         
         return v
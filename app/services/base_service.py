@@ -1,6 +1,6 @@
-from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union
+from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Union, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.utils.logger import get_logger, get_request_id
+from app.utils.logger import DEBUG_ENABLED, get_logger, get_request_id
 from app.repositories.base_repository import BaseRepository
 from app.models.base_model import BaseModel
 
@@ -37,7 +37,8 @@ class BaseService(Generic[ModelType, RepositoryType]):
         Returns:
             Record object or None if not found
         """
-        self.logger.debug(f"Getting {self.repository.model.__name__} with id: {id}")
+        if DEBUG_ENABLED:
+            self.logger.debug("Getting {} with id: {}", self.repository.model.__name__, id)
         return await self.repository.get_by_id(db, id=id)
     
     async def get_all(
@@ -47,7 +48,8 @@ class BaseService(Generic[ModelType, RepositoryType]):
         skip: int = 0, 
         limit: int = 100,
         filter_by: Dict[str, Any] = None,
-        order_by: List[str] = None
+        order_by: List[str] = None,
+        load_related: List[str] = None
     ) -> List[ModelType]:
         """
         Get all records with optional filtering, sorting, and pagination
@@ -58,12 +60,48 @@ class BaseService(Generic[ModelType, RepositoryType]):
             limit: Maximum number of records to return
             filter_by: Dictionary of filter conditions {column_name: value}
             order_by: List of columns to sort by, prefix with - for descending
+            load_related: Relationships to eager-load; pass every relationship
+                the response schema serializes, or each row lazy-loads it (N+1)
               Returns:
             List of record objects
         """
-        self.logger.debug(f"Getting list of {self.repository.model.__name__}")
+        if DEBUG_ENABLED:
+            self.logger.debug("Getting list of {}", self.repository.model.__name__)
         return await self.repository.get_all(
-            db, skip=skip, limit=limit, filter_by=filter_by, order_by=order_by
+            db, skip=skip, limit=limit, filter_by=filter_by, order_by=order_by,
+            load_related=load_related
+        )
+    
+    async def get_page(
+        self, 
+        db: AsyncSession, 
+        *, 
+        skip: int = 0, 
+        limit: int = 100,
+        filter_by: Dict[str, Any] = None,
+        order_by: List[str] = None,
+        load_related: List[str] = None
+    ) -> Tuple[List[ModelType], int]:
+        """
+        Get a page of records and the total count in a single query
+        
+        Args:
+            db: Database session
+            skip: Number of records to skip (offset)
+            limit: Maximum number of records to return
+            filter_by: Dictionary of filter conditions {column_name: value}
+            order_by: List of columns to sort by, prefix with - for descending
+            load_related: Relationships to eager-load; pass every relationship
+                the response schema serializes, or each row lazy-loads it (N+1)
+            
+        Returns:
+            Tuple of (list of record objects, total number of matching records)
+        """
+        if DEBUG_ENABLED:
+            self.logger.debug("Getting page of {}", self.repository.model.__name__)
+        return await self.repository.get_page(
+            db, skip=skip, limit=limit, filter_by=filter_by, order_by=order_by,
+            load_related=load_related
         )
     
     async def count(self, db: AsyncSession, filter_by: Dict[str, Any] = None) -> int:
@@ -89,9 +127,23 @@ class BaseService(Generic[ModelType, RepositoryType]):
               Returns:
             Created record object
         """
-        self.logger.info(f"Creating new {self.repository.model.__name__}")
+        self.logger.info("Creating new {}", self.repository.model.__name__)
         return await self.repository.create(db, obj_in=obj_in)
     
+    async def create_many(self, db: AsyncSession, *, objs_in: List[Dict[str, Any]]) -> List[ModelType]:
+        """
+        Create many records in one transaction
+        
+        Args:
+            db: Database session
+            objs_in: List of column dictionaries
+            
+        Returns:
+            Created record objects
+        """
+        self.logger.info("Creating {} {} records", len(objs_in), self.repository.model.__name__)
+        return await self.repository.create_many(db, objs_in=objs_in)
+    
     async def update(
         self, 
         db: AsyncSession, 
@@ -109,14 +161,12 @@ class BaseService(Generic[ModelType, RepositoryType]):
             
         Returns:
             Updated record object or None if not found
-        """        
-        
-        db_obj = await self.repository.get_by_id(db, id=id)
-        if db_obj:
-            self.logger.info(f"Updating {self.repository.model.__name__} with id: {id}")
-            return await self.repository.update(db, db_obj=db_obj, obj_in=obj_in)
-        self.logger.warning(f"{self.repository.model.__name__} with id {id} not found for update")
-        return None
+        """
+        self.logger.info("Updating {} with id: {}", self.repository.model.__name__, id)
+        db_obj = await self.repository.update_by_id(db, id=id, obj_in=obj_in)
+        if db_obj is None:
+            self.logger.warning(f"{self.repository.model.__name__} with id {id} not found for update")
+        return db_obj
     
     async def delete(self, db: AsyncSession, *, id: str) -> Optional[ModelType]:
         """
@@ -128,14 +178,12 @@ class BaseService(Generic[ModelType, RepositoryType]):
             
         Returns:
             Deleted record object or None if not found
-        """        
-        
-        db_obj = await self.repository.get_by_id(db, id=id)
-        if db_obj:
-            self.logger.info(f"Deleting {self.repository.model.__name__} with id: {id}")
-            return await self.repository.delete(db, id=id)
-        self.logger.warning(f"{self.repository.model.__name__} with id {id} not found for deletion")
-        return None
+        """
+        self.logger.info("Deleting {} with id: {}", self.repository.model.__name__, id)
+        db_obj = await self.repository.delete(db, id=id)
+        if db_obj is None:
+            self.logger.warning(f"{self.repository.model.__name__} with id {id} not found for deletion")
+        return db_obj
     
     async def soft_delete(self, db: AsyncSession, *, id: str) -> Optional[ModelType]:
         """
@@ -147,11 +195,9 @@ class BaseService(Generic[ModelType, RepositoryType]):
             
         Returns:
             Updated record object or None if not found
-        """        
-        
-        db_obj = await self.repository.get_by_id(db, id=id)
-        if db_obj:
-            self.logger.info(f"Soft-deleting {self.repository.model.__name__} with id: {id}")
-            return await self.repository.soft_delete(db, id=id)
-        self.logger.warning(f"{self.repository.model.__name__} with id {id} not found for soft-deletion")
-        return None
+        """
+        self.logger.info("Soft-deleting {} with id: {}", self.repository.model.__name__, id)
+        db_obj = await self.repository.soft_delete(db, id=id)
+        if db_obj is None:
+            self.logger.warning(f"{self.repository.model.__name__} with id {id} not found for soft-deletion")
+        return db_obj
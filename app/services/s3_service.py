@@ -1,14 +1,30 @@
+import asyncio
 import boto3
-import uuid
+import contextvars
+import functools
+import secrets
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, BinaryIO
-from botocore.exceptions import ClientError, NoCredentialsError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError, NoCredentialsError
 from app.config.settings import settings
 from app.utils.logger import get_logger
 import os
+import time
 from datetime import datetime
 
 logger = get_logger("s3-service")
 
+# Timestamp prefix for uploaded file keys, e.g. 20250801_073352
+_FILENAME_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+# Worker threads for blocking boto3 calls, one per pooled connection, so
+# uploads don't queue behind other work in the default executor
+_S3_EXECUTOR = ThreadPoolExecutor(max_workers=settings.S3_MAX_POOL, thread_name_prefix="s3")
+
+# Upper bound on cached presigned URLs; the oldest entry is evicted first
+_URL_CACHE_MAXSIZE = 10_000
+
 class S3Service:
     """Service for S3 operations"""
     
@@ -20,14 +36,41 @@ class S3Service:
                 endpoint_url=settings.AWS_ENDPOINT_URL,
                 aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_DEFAULT_REGION
+                region_name=settings.AWS_DEFAULT_REGION,
+                # One client serves every request (the low-level client is
+                # thread-safe), so size its pool for concurrent uploads
+                config=Config(
+                    max_pool_connections=settings.S3_MAX_POOL,
+                    retries={'mode': 'standard', 'total_max_attempts': 5},
+                    tcp_keepalive=True
+                )
             )
             self.bucket_name = settings.S3_BUCKET_NAME
-            logger.info(f"S3 client initialized with bucket: {self.bucket_name}")
+            # (file_key, expiration) -> (url, monotonic time it was signed at)
+            self._url_cache = {}
+            # Set once the bucket is known to exist; checked at startup, not per upload
+            self._bucket_ready = False
+            logger.info("S3 client initialized with bucket: {}", self.bucket_name)
         except Exception as e:
             logger.error(f"Failed to initialize S3 client: {str(e)}")
             raise
     
+    async def _run_blocking(self, func, *args, **kwargs):
+        """
+        Run a blocking boto3 call on the S3 executor
+        
+        Args:
+            func: Client method to call
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+            
+        Returns:
+            Whatever func returns
+        """
+        # Like asyncio.to_thread, keep context vars (request id) in the worker
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(_S3_EXECUTOR, call)
+    
     async def create_bucket_if_not_exists(self) -> bool:
         """
         Create S3 bucket if it doesn't exist
@@ -37,23 +80,41 @@ class S3Service:
         """
         try:
             # Check if bucket exists
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
-            logger.debug(f"Bucket {self.bucket_name} already exists")
+            await self._run_blocking(self.s3_client.head_bucket, Bucket=self.bucket_name)
+            logger.debug("Bucket {} already exists", self.bucket_name)
             return True
         except ClientError as e:
             error_code = e.response['Error']['Code']
             if error_code == '404':
                 # Bucket doesn't exist, create it
                 try:
-                    self.s3_client.create_bucket(Bucket=self.bucket_name)
-                    logger.info(f"Created bucket: {self.bucket_name}")
+                    await self._run_blocking(self.s3_client.create_bucket, Bucket=self.bucket_name)
+                    logger.info("Created bucket: {}", self.bucket_name)
                     return True
-                except ClientError as create_error:
+                except (ClientError, BotoCoreError) as create_error:
                     logger.error(f"Failed to create bucket {self.bucket_name}: {str(create_error)}")
                     return False
             else:
                 logger.error(f"Error checking bucket {self.bucket_name}: {str(e)}")
                 return False
+        except BotoCoreError as e:
+            # Endpoint unreachable, credentials missing, etc.; callers retry later
+            logger.error(f"Could not reach S3 to check bucket {self.bucket_name}: {str(e)}")
+            return False
+    
+    async def ensure_bucket(self) -> bool:
+        """
+        Make sure the bucket exists, checking S3 only until it succeeds once
+        
+        A failed check (e.g. S3 unreachable at startup) leaves the flag unset,
+        so the next upload tries again.
+        
+        Returns:
+            True if the bucket is ready
+        """
+        if not self._bucket_ready:
+            self._bucket_ready = await self.create_bucket_if_not_exists()
+        return self._bucket_ready
     
     def generate_unique_filename(self, original_filename: str) -> str:
         """
@@ -63,15 +124,15 @@ class S3Service:
             original_filename: Original file name
             
         Returns:
-            Unique filename with timestamp and UUID in tmp folder
+            Unique filename with timestamp and random suffix in tmp folder
         """
         
         # Get file extension
         _, ext = os.path.splitext(original_filename)
         
         # Generate unique filename
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]
+        timestamp = datetime.utcnow().strftime(_FILENAME_TIMESTAMP_FORMAT)
+        unique_id = secrets.token_hex(4)
         
         # Upload to tmp folder (with 7-day auto-delete lifecycle)
         return f"{settings.S3_TEMP_FOLDER}/{timestamp}_{unique_id}{ext}"
@@ -94,16 +155,17 @@ class S3Service:
             S3 file path/key if successful, None otherwise
         """
         try:
-            # Ensure bucket exists
-            if not await self.create_bucket_if_not_exists():
+            # Ensure bucket exists (no request once it has been confirmed)
+            if not await self.ensure_bucket():
                 logger.error("Failed to ensure bucket exists")
                 return None
             
             # Generate unique filename
             file_key = self.generate_unique_filename(original_filename)
             
-            # Upload file
-            self.s3_client.upload_fileobj(
+            # Upload file; boto3 is blocking, so run it on the S3 executor
+            await self._run_blocking(
+                self.s3_client.upload_fileobj,
                 file_obj,
                 self.bucket_name,
                 file_key,
@@ -115,7 +177,7 @@ class S3Service:
                 }
             )
             
-            logger.info(f"Successfully uploaded file: {file_key}")
+            logger.info("Successfully uploaded file: {}", file_key)
             return file_key
             
         except NoCredentialsError:
@@ -132,6 +194,10 @@ class S3Service:
         """
         Generate presigned URL for file access
         
+        Signing happens locally without a network call, so this stays synchronous.
+        URLs are cached per (file_key, expiration) and reused until they have less
+        than S3_PRESIGNED_URL_CACHE_MARGIN seconds of validity left.
+        
         Args:
             file_key: S3 file path/key
             expiration: URL expiration time in seconds (default: 1 hour)
@@ -139,20 +205,48 @@ class S3Service:
         Returns:
             Presigned URL if successful, None otherwise
         """
+        cache_key = (file_key, expiration)
+        now = time.monotonic()
+        cached = self._url_cache.get(cache_key)
+        if cached and now - cached[1] < expiration - settings.S3_PRESIGNED_URL_CACHE_MARGIN:
+            return cached[0]
+        
         try:
             url = self.s3_client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket_name, 'Key': file_key},
                 ExpiresIn=expiration
             )
-            logger.debug(f"Generated presigned URL for: {file_key}")
-            return url
+            logger.debug("Generated presigned URL for: {}", file_key)
         except ClientError as e:
             logger.error(f"Failed to generate presigned URL for {file_key}: {str(e)}")
             return None
         except Exception as e:
             logger.error(f"Unexpected error generating presigned URL: {str(e)}")
             return None
+        
+        if expiration > settings.S3_PRESIGNED_URL_CACHE_MARGIN:
+            self._url_cache.pop(cache_key, None)
+            if len(self._url_cache) >= _URL_CACHE_MAXSIZE:
+                del self._url_cache[next(iter(self._url_cache))]
+            self._url_cache[cache_key] = (url, now)
+        return url
+    
+    def presigned_url_expires_in(self, file_key: str, expiration: int = 3600) -> int:
+        """
+        Seconds of validity left on the URL generate_presigned_url returns for these arguments
+        
+        Args:
+            file_key: S3 file path/key
+            expiration: URL expiration time in seconds, as passed to generate_presigned_url
+            
+        Returns:
+            Remaining lifetime in seconds (the full expiration if the URL isn't cached)
+        """
+        cached = self._url_cache.get((file_key, expiration))
+        if cached is None:
+            return expiration
+        return max(0, int(expiration - (time.monotonic() - cached[1])))
 
 # Create instance for dependency injection
 s3_service = S3Service()
@@ -1,12 +1,12 @@
 from typing import Optional
 from fastapi import UploadFile, HTTPException, status
 from pydantic import ValidationError
-import io
+import os
 
 from app.services.s3_service import s3_service
-from app.schemas.upload_schema import FileValidationRequest, ImageUploadResponse
+from app.schemas.upload_schema import FileValidationRequest, ImageUploadResponse, content_type_error
 from app.config.settings import settings
-from app.utils.logger import get_logger
+from app.utils.logger import DEBUG_ENABLED, get_logger
 
 logger = get_logger("upload-service")
 
@@ -16,13 +16,13 @@ class UploadService:
     def __init__(self):
         self.s3_service = s3_service
     
-    def validate_upload_file(self, file: UploadFile, file_content: bytes) -> FileValidationRequest:
+    def validate_upload_file(self, file: UploadFile, file_size: int) -> FileValidationRequest:
         """
         Validate uploaded file using Pydantic schema
         
         Args:
             file: FastAPI UploadFile object
-            file_content: Raw file content bytes
+            file_size: Size of the uploaded file in bytes
             
         Returns:
             Validated FileValidationRequest object
@@ -30,23 +30,34 @@ class UploadService:
         Raises:
             HTTPException: If validation fails
         """
+        content_type = file.content_type
+        
+        # Reject disallowed types with a set lookup before building the schema
+        error_msg = content_type_error(content_type)
+        if error_msg:
+            logger.warning(f"File validation failed: {error_msg}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error_msg
+            )
+        
         try:
-            # Create validation data
-            validation_data = {
-                'filename': file.filename or '',
-                'content_type': file.content_type or '',
-                'file_size': len(file_content)
-            }
-            
             # Validate using Pydantic schema
-            validated_file = FileValidationRequest(**validation_data)
+            filename = file.filename
+            validated_file = FileValidationRequest(
+                filename=filename if filename is not None else '',
+                content_type=content_type,
+                file_size=file_size
+            )
             
-            logger.debug(f"File validation passed: {validated_file.filename}")
+            if DEBUG_ENABLED:
+                logger.debug("File validation passed: {}", validated_file.filename)
             return validated_file
             
         except ValidationError as e:
             # Extract the first validation error message
-            error_msg = str(e.errors()[0]['msg']) if e.errors() else "Invalid file"
+            errors = e.errors()
+            error_msg = str(errors[0]['msg']) if errors else "Invalid file"
             logger.warning(f"File validation failed: {error_msg}")
             
             raise HTTPException(
@@ -60,6 +71,21 @@ class UploadService:
                 detail="File validation error"
             )
     
+    def get_upload_size(self, file: UploadFile) -> int:
+        """
+        Size of an uploaded file in bytes, without reading its content
+        
+        Args:
+            file: FastAPI UploadFile object
+            
+        Returns:
+            File size in bytes
+        """
+        if file.size is not None:
+            return file.size
+        # UploadFile built outside the form parser: measure the underlying file
+        return file.file.seek(0, os.SEEK_END)
+    
     async def process_file_upload(
         self, 
         file: UploadFile, 
@@ -78,7 +104,7 @@ class UploadService:
         Raises:
             HTTPException: If any step fails
         """
-        logger.info(f"Processing file upload: {file.filename}, user: {username}")
+        logger.info("Processing file upload: {}, user: {}", file.filename, username)
         
         # Basic file checks
         if not file.filename:
@@ -88,9 +114,11 @@ class UploadService:
                 detail="No file provided"
             )
         
-        # Read file content
+        # The form parser has already spooled the body to a temporary file, so
+        # validate from its size and stream that file to S3 instead of reading
+        # it into memory
         try:
-            file_content = await file.read()
+            file_size = self.get_upload_size(file)
         except Exception as e:
             logger.error(f"Error reading file content: {str(e)}")
             raise HTTPException(
@@ -99,14 +127,14 @@ class UploadService:
             )
         
         # Validate file using schema
-        validated_file = self.validate_upload_file(file, file_content)
+        validated_file = self.validate_upload_file(file, file_size)
         
         # Get expiration from settings
         expiration = settings.S3_PRESIGNED_URL_EXPIRATION
         
         try:
-            # Create BytesIO object from file content
-            file_obj = io.BytesIO(file_content)
+            file_obj = file.file
+            file_obj.seek(0)
             
             # Upload to S3
             file_key = await self.s3_service.upload_file(
@@ -145,10 +173,11 @@ class UploadService:
                 content_type=validated_file.content_type,
                 file_size=validated_file.file_size,
                 bucket_name=settings.S3_BUCKET_NAME,
-                expires_in=expiration
+                # A cached URL may have been signed earlier; report what's left
+                expires_in=self.s3_service.presigned_url_expires_in(file_key, expiration)
             )
             
-            logger.info(f"Successfully processed upload: {file_key}, user: {username}")
+            logger.info("Successfully processed upload: {}, user: {}", file_key, username)
             return upload_response
             
         except HTTPException:
@@ -179,7 +208,8 @@ class UploadService:
         Raises:
             HTTPException: If URL generation fails
         """
-        logger.debug(f"Generating URL for file: {file_key}, user: {username}")
+        if DEBUG_ENABLED:
+            logger.debug("Generating URL for file: {}, user: {}", file_key, username)
         
         # Get expiration from settings
         expiration = settings.S3_PRESIGNED_URL_EXPIRATION
@@ -201,7 +231,7 @@ class UploadService:
             return {
                 "url": presigned_url,
                 "file_key": file_key,
-                "expires_in": expiration,
+                "expires_in": self.s3_service.presigned_url_expires_in(file_key, expiration),
                 "message": "Presigned URL generated successfully"
             }
             
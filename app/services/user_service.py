@@ -1,9 +1,10 @@
-from typing import Optional, List, Dict, Any
+import asyncio
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.base_service import BaseService
 from app.repositories.user_repository import user_repository
 from app.models.user import GenderEnum, User
-from app.utils.logger import get_logger
+from app.utils.logger import DEBUG_ENABLED, get_logger
 
 # Initialize logger
 logger = get_logger("user-service")
@@ -16,30 +17,26 @@ class UserService(BaseService[User, type(user_repository)]):
     
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         """Get user by email"""
-        logger.debug(f"Looking up user by email: {email}")
+        if DEBUG_ENABLED:
+            logger.debug("Looking up user by email: {}", email)
         return await user_repository.get_by_email(db, email=email)
     
     async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
         """Get user by username"""
-        logger.debug(f"Looking up user by username: {username}")
+        if DEBUG_ENABLED:
+            logger.debug("Looking up user by username: {}", username)
         return await user_repository.get_by_username(db, username=username)
 
+    async def get_account_status(self, db: AsyncSession, id: int) -> Optional[Tuple[bool, bool]]:
+        """Get (is_active, is_superuser) for a user id"""
+        return await user_repository.get_account_status(db, id=id)
+
     async def create_user(self, db: AsyncSession, username: str, email: str, password: str, gender: GenderEnum, full_name: str = None, is_superuser: bool = False) -> User:
         """Create a new user"""
-        logger.info(f"Creating new user with username: {username}, email: {email}")
-        
-        # Check if email already exists
-        if await self.get_by_email(db, email=email):
-            logger.warning(f"Attempt to create user with existing email: {email}")
-            raise ValueError(f"User with email {email} already exists")
+        logger.info("Creating new user with username: {}, email: {}", username, email)
         
-        # Check if username already exists
-        if await self.get_by_username(db, username=username):
-            logger.warning(f"Attempt to create user with existing username: {username}")
-            raise ValueError(f"User with username {username} already exists")
-        
-        # Create user
-        return await user_repository.create_user(
+        # Insert first; only look up the conflicting field if the insert was skipped
+        user = await user_repository.create_user(
             db=db,
             username=username,
             email=email,
@@ -48,17 +45,36 @@ class UserService(BaseService[User, type(user_repository)]):
             is_superuser=is_superuser,
             gender=gender
         )
+        if user is not None:
+            return user
+        
+        # One query tells which unique value conflicted
+        email_taken, username_taken = await user_repository.exists_by_email_or_username(
+            db, email=email, username=username
+        )
+        if email_taken:
+            logger.warning(f"Attempt to create user with existing email: {email}")
+            raise ValueError(f"User with email {email} already exists")
+        
+        if username_taken:
+            logger.warning(f"Attempt to create user with existing username: {username}")
+            raise ValueError(f"User with username {username} already exists")
+        
+        logger.warning(f"Attempt to create user with an existing unique value: {username}")
+        raise ValueError("User already exists")
     
     async def authenticate_user(self, db: AsyncSession, username: str, password: str) -> Optional[User]:
         """Authenticate a user by username and password"""
-        logger.debug(f"Authenticating user: {username}")
+        if DEBUG_ENABLED:
+            logger.debug("Authenticating user: {}", username)
         user = await self.get_by_username(db, username=username)
         
         if not user:
             logger.warning(f"Authentication failed: user not found: {username}")
             return None
         
-        if not user.check_password(password):
+        # Hashing is CPU-bound; verify off the event loop
+        if not await asyncio.to_thread(user.check_password, password):
             logger.warning(f"Authentication failed: incorrect password for user: {username}")
             return None
         
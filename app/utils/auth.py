@@ -1,7 +1,13 @@
 import jwt
-from datetime import datetime, timedelta
+import hmac
+import orjson
+import base64
+import hashlib
+import time
+from dataclasses import dataclass
+from datetime import timedelta
 from typing import Optional, Dict, Any
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,6 +19,49 @@ from app.utils.logger import get_logger
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"/api/v1/auth/token")
 logger = get_logger("auth")
 
+# Lifetime of tokens created without an explicit expires_delta
+_DEFAULT_TOKEN_EXPIRE_SECONDS = 15 * 60
+
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+# Decoded payloads of recently verified tokens, keyed by a digest of the token
+# so raw tokens aren't kept in memory: digest -> (payload, monotonic expiry)
+_TOKEN_CACHE = {}
+_TOKEN_CACHE_TTL = 60  # seconds; a cached payload is also dropped once its "exp" passes
+_TOKEN_CACHE_MAXSIZE = 50_000
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as JWT requires"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# HMAC keyed with the secret once at import. copy() reuses the precomputed
+# inner/outer pad state, so each signature only hashes the message itself.
+_HMAC_DIGEST = _HMAC_DIGESTS.get(settings.JWT_ALGORITHM)
+_HMAC_SIGNER = hmac.new(settings.JWT_SECRET_KEY.encode(), digestmod=_HMAC_DIGEST) if _HMAC_DIGEST else None
+_JWT_HEADER_B64 = _b64url(
+    orjson.dumps({"alg": settings.JWT_ALGORITHM, "typ": "JWT"})
+)
+
+def _encode_hmac_jwt(payload: Dict[str, Any]) -> str:
+    """
+    Encode and sign a JWT with the precomputed HMAC key
+    
+    Matches jwt.encode for ASCII claims. Non-ASCII strings are written as
+    raw UTF-8 where PyJWT escapes them to \\uXXXX, so those tokens differ
+    byte-wise from PyJWT's but decode to the same claims.
+    
+    Args:
+        payload: JSON-serializable claims ("exp" already an int timestamp)
+        
+    Returns:
+        JWT token as string
+    """
+    payload_b64 = _b64url(orjson.dumps(payload))
+    signing_input = _JWT_HEADER_B64 + b"." + payload_b64
+    signer = _HMAC_SIGNER.copy()
+    signer.update(signing_input)
+    return (signing_input + b"." + _b64url(signer.digest())).decode()
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT token
@@ -26,12 +75,13 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     """
     to_encode = data.copy()
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-        
-    to_encode.update({"exp": expire})
+    # "exp" is a NumericDate (RFC 7519), so compute it in epoch seconds directly
+    expires_in = int(expires_delta.total_seconds()) if expires_delta else _DEFAULT_TOKEN_EXPIRE_SECONDS
+    to_encode["exp"] = int(time.time()) + expires_in
+    
+    if _HMAC_SIGNER is not None:
+        return _encode_hmac_jwt(to_encode)
+    
     encoded_jwt = jwt.encode(
         to_encode, 
         settings.JWT_SECRET_KEY, 
@@ -40,23 +90,53 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     
     return encoded_jwt
 
+def get_token_claims(user) -> Dict[str, Any]:
+    """
+    Build the access token claims for a user
+    
+    Besides "sub", the user's id is embedded so read-only endpoints can
+    check the account by primary key instead of loading the whole row.
+    Permissions are not embedded: they are always read from the database.
+    
+    Args:
+        user: User object
+        
+    Returns:
+        Claims to pass to create_access_token
+    """
+    return {
+        "sub": user.username,
+        "user_id": user.id,
+    }
+
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode a JWT token
     
+    Verified payloads are cached for a short time, so a client reusing its
+    token isn't re-verified on every request.
+    
     Args:
         token: JWT token
         
     Returns:
         Decoded token payload
     """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        payload, expires_at = cached
+        exp = payload.get("exp")
+        if expires_at > time.monotonic() and (exp is None or exp > time.time()):
+            return payload
+        del _TOKEN_CACHE[cache_key]
+    
     try:
         payload = jwt.decode(
             token, 
             settings.JWT_SECRET_KEY, 
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except jwt.exceptions.InvalidTokenError as e:
         logger.error(f"Error decoding token: {str(e)}")
         raise HTTPException(
@@ -64,13 +144,45 @@ def decode_token(token: str) -> Dict[str, Any]:
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    if len(_TOKEN_CACHE) >= _TOKEN_CACHE_MAXSIZE:
+        del _TOKEN_CACHE[next(iter(_TOKEN_CACHE))]
+    _TOKEN_CACHE[cache_key] = (payload, time.monotonic() + _TOKEN_CACHE_TTL)
+    return payload
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
+async def get_token_payload(request: Request, token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
     """
-    Verify token and return current user
+    Verify the bearer token once per request
+    
+    The payload is kept on request.state.jwt_payload, so every auth
+    dependency in the request (and the route itself) reuses it.
     
     Args:
+        request: The current request
         token: JWT token
+        
+    Returns:
+        Decoded token payload
+    """
+    payload = getattr(request.state, "jwt_payload", None)
+    if payload is None:
+        payload = decode_token(token)
+        request.state.jwt_payload = payload
+    return payload
+
+@dataclass(frozen=True)
+class AuthPrincipal:
+    """Authenticated caller: identity from the token, permissions from the database"""
+    id: int
+    username: str
+    is_superuser: bool = False
+
+async def get_current_user(payload: Dict[str, Any] = Depends(get_token_payload), db: AsyncSession = Depends(get_db)):
+    """
+    Verify token and return current user
+    
+    Args:
+        payload: Verified token payload
         db: Database session
         
     Returns:
@@ -82,16 +194,10 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = decode_token(token)
-        username: str = payload.get("sub")
-        
-        if username is None:
-            logger.warning("Token missing 'sub' claim")
-            raise credentials_exception
-            
-    except jwt.exceptions.InvalidTokenError:
-        logger.warning("Invalid token")
+    username: str = payload.get("sub")
+    
+    if username is None:
+        logger.warning("Token missing 'sub' claim")
         raise credentials_exception
         
     user = await user_service.get_by_username(db, username=username)
@@ -120,3 +226,52 @@ async def get_current_active_user(current_user = Depends(get_current_user)):
         )
         
     return current_user
+
+
+async def get_current_active_user_light(
+    payload: Dict[str, Any] = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_db)
+) -> AuthPrincipal:
+    """
+    Verify token and return the caller, reading two columns instead of the user row
+    
+    This still costs one query per request: the user id comes from the
+    token claims, but is_active and is_superuser are read from the
+    database by primary key. Deactivated, soft-deleted and deleted users
+    are therefore rejected immediately rather than when their token
+    expires, and a revoked superuser flag takes effect at once. Tokens
+    issued without a user_id claim fall back to loading the user.
+    
+    Args:
+        payload: Verified token payload
+        db: Database session
+        
+    Returns:
+        AuthPrincipal for the current user
+    """
+    username = payload.get("sub")
+    user_id = payload.get("user_id")
+    
+    if username is None or user_id is None:
+        # Token without identity claims: load the user as before
+        user = await get_current_active_user(await get_current_user(payload=payload, db=db))
+        return AuthPrincipal(id=user.id, username=user.username, is_superuser=user.is_superuser)
+    
+    status_row = await user_service.get_account_status(db, id=user_id)
+    if status_row is None:
+        logger.warning(f"User from token not found: {username}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    is_active, is_superuser = status_row
+    if not is_active:
+        logger.warning(f"Inactive user attempt: {username}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, 
+            detail="Inactive user"
+        )
+    
+    return AuthPrincipal(id=user_id, username=username, is_superuser=is_superuser)
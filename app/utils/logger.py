@@ -7,9 +7,16 @@ from app.config.settings import settings
 # Create a context variable to store request ID
 request_id_var = contextvars.ContextVar("request_id", default=None)
 
+def _inject_request_id(record):
+    """Read the request ID from the context var when a record is emitted"""
+    record["extra"]["request_id"] = request_id_var.get() or "no-request-id"
+
 # Remove default logger
 logger.remove()
 
+# Resolve request_id at emission time, so module-level loggers stay correct
+logger.configure(patcher=_inject_request_id)
+
 # Enhanced log format with request ID
 log_format = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{extra[request_id]}</cyan> | <blue>{extra[context]}</blue> | <level>{message}</level>"
 
@@ -36,6 +43,10 @@ if settings.LOG_FILE_PATH:
         compression="zip",  # Compress rotated logs
     )
 
+# Whether debug records can be emitted at all; hot paths check this before
+# calling logger.debug so suppressed lines cost one bool test
+DEBUG_ENABLED = logger.level(settings.LOG_LEVEL.upper()).no <= logger.level("DEBUG").no
+
 def set_request_id(id_value):
     """Set the request ID for the current context"""
     if id_value:
@@ -45,8 +56,13 @@ def get_request_id():
     """Get the request ID for the current context"""
     return request_id_var.get()
 
+# Bound loggers by name, so repeated get_logger calls don't allocate new ones
+_LOGGERS = {}
+
 # Create a function to get logger
 def get_logger(name=None):
-    """Get a logger with an optional name and current request ID"""
-    request_id = get_request_id() or "no-request-id"
-    return logger.bind(context=name, request_id=request_id)
+    """Get a logger with an optional name; the current request ID is added per record"""
+    bound = _LOGGERS.get(name)
+    if bound is None:
+        bound = _LOGGERS[name] = logger.bind(context=name)
+    return bound
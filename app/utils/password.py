@@ -0,0 +1,47 @@
+import os
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from werkzeug.security import check_password_hash
+
+if os.getenv("APP_ENV") == "test":
+    # Minimum Argon2id cost; tests create many users and don't need slow hashes
+    _hasher = PasswordHasher(time_cost=1, memory_cost=8, parallelism=1)
+else:
+    # Argon2id with a cost tuned for interactive logins (~64 MiB, 2 passes)
+    _hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
+_ARGON2_PREFIX = "$argon2"
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with Argon2id
+    
+    Args:
+        password: Plain text password
+        
+    Returns:
+        Encoded password hash
+    """
+    return _hasher.hash(password)
+
+def verify_password(hashed_password: str, password: str) -> bool:
+    """
+    Check a password against a stored hash
+    
+    Hashes created before the switch to Argon2 (Werkzeug PBKDF2/scrypt)
+    are still accepted so existing users can log in.
+    
+    Args:
+        hashed_password: Stored password hash
+        password: Plain text password
+        
+    Returns:
+        True if the password matches
+    """
+    if not hashed_password.startswith(_ARGON2_PREFIX):
+        return check_password_hash(hashed_password, password)
+    
+    try:
+        return _hasher.verify(hashed_password, password)
+    except (VerificationError, InvalidHashError):
+        return False
@@ -3,18 +3,19 @@ Utility functions for generating trace IDs and working with request context.
 
 This module provides helper functions for request tracing and context management.
 """
-import uuid
-from fastapi import Request, Response
-from app.utils.logger import get_logger, set_request_id, get_request_id
+import secrets
+from typing import Optional
+from starlette.types import Scope
+from app.utils.logger import get_logger, set_request_id
 
 def generate_request_id() -> str:
     """
-    Generate a unique request ID using UUID4.
+    Generate a unique request ID: 128 random bits as 32 hex characters.
     
     Returns:
         A string containing a unique request ID
     """
-    return str(uuid.uuid4())
+    return secrets.token_hex(16)
 
 def get_trace_logger(name: str = None) -> "Logger":
     """
@@ -30,47 +31,47 @@ def get_trace_logger(name: str = None) -> "Logger":
     Returns:
         A logger instance with request ID bound
     """
-    request_id = get_request_id()
-    return get_logger(name)  # The get_logger function already binds the request ID
+    return get_logger(name)  # The request ID is read from the context var per record
 
-def set_trace_context_from_request(request: Request) -> str:
+def get_request_id_from_scope(scope: Scope) -> Optional[str]:
     """
-    Set tracing context based on a FastAPI request.
+    Read the X-Request-ID header straight from an ASGI scope.
     
-    This function extracts the request ID from the request object
-    (or generates a new one) and sets it in the context.
+    Args:
+        scope: The ASGI connection scope
+        
+    Returns:
+        The request ID sent by the client, or None if absent
+    """
+    for name, value in scope.get("headers", ()):
+        if name == b"x-request-id":
+            return value.decode("latin-1")
+    return None
+
+def set_trace_context_from_scope(scope: Scope) -> str:
+    """
+    Set tracing context based on a raw ASGI scope.
+    
+    Uses the X-Request-ID header, then scope["state"]["request_id"], and
+    otherwise generates a new ID. Works on the scope directly so pure ASGI
+    middleware doesn't need to build a Request.
     
     Args:
-        request: The FastAPI request object
+        scope: The ASGI connection scope
         
     Returns:
         The request ID that was set
     """
-    # Use existing request ID from headers if available
-    request_id = request.headers.get("X-Request-ID")
-    
-    # If no request ID in headers, check if it was already set in request.state
-    if not request_id:
-        request_id = getattr(request.state, "request_id", None)
+    state = scope.setdefault("state", {})
     
-    # If still no request ID, generate a new one
+    request_id = get_request_id_from_scope(scope) or state.get("request_id")
     if not request_id:
         request_id = generate_request_id()
-        
-    # Set the request ID in the request.state for other middleware/handlers
-    request.state.request_id = request_id
+    
+    # request.state.request_id reads from scope["state"]
+    state["request_id"] = request_id
     
     # Set the request ID in the context for logging
     set_request_id(request_id)
     
     return request_id
-
-def add_trace_headers_to_response(response: Response, request_id: str) -> None:
-    """
-    Add tracing headers to a FastAPI response.
-    
-    Args:
-        response: The FastAPI response object
-        request_id: The request ID to include in headers
-    """
-    response.headers["X-Request-ID"] = request_id
@@ -1,9 +1,21 @@
+import orjson
 from celery import Celery
+from kombu.serialization import register
 from app.config.settings import settings
 from app.utils.logger import get_logger
 
 logger = get_logger("celery")
 
+# orjson-backed serializer for task messages and results. Workers still
+# accept plain "json" so messages queued before the switch are consumed.
+register(
+    "orjson",
+    orjson.dumps,
+    orjson.loads,
+    content_type="application/x-orjson",
+    content_encoding="binary",
+)
+
 # Configure Celery app
 celery_app = Celery(
     "app",
@@ -14,14 +26,21 @@ celery_app = Celery(
 
 # Configure Celery settings
 celery_app.conf.update(
-    task_serializer="json",
-    accept_content=["json"],
-    result_serializer="json",
+    task_serializer="orjson",
+    accept_content=["orjson", "json"],
+    result_serializer="orjson",
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
     worker_hijack_root_logger=False,
     task_send_sent_event=True,
+    # Long tasks: ack after completion and don't prefetch work onto busy
+    # processes, so queued tasks go to whichever worker is free
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    worker_max_tasks_per_child=1000,  # Recycle processes to bound memory growth
+    broker_connection_retry_on_startup=True,
+    broker_pool_limit=50,
 )
 
 # Initialize Celery app
@@ -18,14 +18,14 @@ def example_task(name: str):
     Returns:
         Result message
     """
-    logger.info(f"Running example task for {name}")
+    logger.info("Running example task for {}", name)
     
     # Simulate task processing
     import time
     time.sleep(2)
     
     result = f"Hello, {name}! Task completed."
-    logger.info(f"Task completed with result: {result}")
+    logger.info("Task completed with result: {}", result)
     
     return result
 
@@ -42,7 +42,7 @@ def process_data(self, data_id: str, options: dict = None):
     Returns:
         Processing result
     """
-    logger.info(f"Processing data {data_id} with options {options}")
+    logger.info("Processing data {} with options {}", data_id, options)
     
     try:
         # Simulate processing
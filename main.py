@@ -1,22 +1,43 @@
+import os
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.config.settings import settings
-from app.controllers import api_router
+from app.config.database import warm_up_pool
+from app.controllers import build_api_router
 from app.config.middlewares import setup_middlewares
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks"""
+    # Open pooled DB connections before uvicorn starts accepting traffic
+    await warm_up_pool()
+    if settings.S3_ENABLED and os.getenv("APP_ENV") != "test":
+        # Imported lazily so boto3 isn't loaded when uploads are disabled
+        from app.services.s3_service import s3_service
+        # Check the bucket once here instead of on every upload
+        await s3_service.ensure_bucket()
+    yield
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
     version=settings.PROJECT_VERSION,
-    docs_url="/docs",
-    redoc_url="/redoc",
+    # OpenAPI schema and docs UIs can be switched off entirely
+    openapi_url="/openapi.json" if settings.ENABLE_OPENAPI else None,
+    docs_url="/docs" if settings.ENABLE_OPENAPI else None,
+    redoc_url="/redoc" if settings.ENABLE_OPENAPI else None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Setup middlewares
 setup_middlewares(app)  # This middleware handles CORS and other middlewares
 
 # Include API router
-app.include_router(api_router)
+app.include_router(build_api_router())
 
 if __name__ == "__main__":
     uvicorn.run(
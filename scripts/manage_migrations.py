@@ -5,27 +5,31 @@ This script provides commands to manage database migrations using Alembic.
 """
 
 import argparse
-import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Add the parent directory to the Python path to make imports work
 sys.path.append(str(Path(__file__).parent.parent))
 
-from alembic.config import Config
-from alembic import command
 from app.config.settings import settings
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_ALEMBIC_INI = str(Path(__file__).resolve().parent.parent / "alembic.ini")
+
+@lru_cache(maxsize=1)
 def get_alembic_config():
-    """Return the Alembic configuration object."""
-    alembic_config = Config(os.path.join(Path(__file__).parent.parent, "alembic.ini"))
+    """Return the Alembic configuration object (parsed once per process)."""
+    # Alembic is imported on first use, so --help and argument errors stay fast
+    from alembic.config import Config
+    alembic_config = Config(_ALEMBIC_INI)
     return alembic_config
 
 def create_migration(message=None):
     """Create a new migration revision."""
+    from alembic import command
     alembic_config = get_alembic_config()
     if message:
         command.revision(alembic_config, message=message, autogenerate=True)
@@ -35,23 +39,27 @@ def create_migration(message=None):
 
 def upgrade_db(revision="head"):
     """Upgrade the database to the specified revision."""
+    from alembic import command
     alembic_config = get_alembic_config()
     command.upgrade(alembic_config, revision)
     logger.info(f"Database upgraded to revision: {revision}")
 
 def downgrade_db(revision="-1"):
     """Downgrade the database to the specified revision."""
+    from alembic import command
     alembic_config = get_alembic_config()
     command.downgrade(alembic_config, revision)
     logger.info(f"Database downgraded to revision: {revision}")
 
 def show_history():
     """Show the migration history."""
+    from alembic import command
     alembic_config = get_alembic_config()
     command.history(alembic_config)
 
 def show_current():
     """Show the current migration revision."""
+    from alembic import command
     alembic_config = get_alembic_config()
     command.current(alembic_config)
 
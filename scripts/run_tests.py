@@ -1,8 +1,7 @@
 """
 Script to run tests with coverage.
 """
-import subprocess
-import sys
+import os
 import argparse
 
 
@@ -21,7 +20,13 @@ def parse_args():
         "--unit-only", action="store_true", help="Run only unit tests"
     )
     parser.add_argument(
-        "test_path", nargs="?", default="tests", help="Specify test path to run"
+        "--serial", action="store_true", help="Run tests in a single process"
+    )
+    parser.add_argument(
+        "--fail-fast", action="store_true", help="Stop at the first failing test"
+    )
+    parser.add_argument(
+        "test_path", nargs="?", help="Specify test path to run (default: testpaths in pytest.ini)"
     )
     return parser.parse_args()
 
@@ -29,11 +34,18 @@ def parse_args():
 def main():
     args = parse_args()
 
-    # Base command
-    if args.coverage:
-        cmd = ["pytest", "-xvs"]
-    else:
-        cmd = ["pytest", "-xvs"]
+    # Base command. Quiet output (pytest.ini disables the cache plugin); no
+    # -x unless asked (stopping at the first failure aborts the other
+    # workers mid-file) and no -s (xdist workers can't stream output)
+    cmd = ["pytest", "-q", "--no-header"]
+    if args.fail_fast:
+        cmd.append("-x")
+
+    # Run test files on one worker per CPU; loadfile keeps each file on a
+    # single worker so its module-level state and ordering are preserved.
+    # Each worker is its own process with its own in-memory test database.
+    if not args.serial:
+        cmd.extend(["-n", "auto", "--dist", "loadfile"])
 
     # Add markers if specified
     if args.api_only:
@@ -49,14 +61,14 @@ def main():
         if args.html:
             cmd.append("--cov-report=html")
 
-    # Add test path
-    cmd.append(args.test_path)
+    # Add test path; without one pytest collects from testpaths
+    if args.test_path:
+        cmd.append(args.test_path)
 
-    # Run the tests
-    process = subprocess.Popen(cmd)
-    process.communicate()
-    return process.returncode
+    # Replace this process with pytest: nothing runs afterwards, and its
+    # exit code becomes ours
+    os.execvp(cmd[0], cmd)
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    main()
@@ -10,12 +10,26 @@ from pathlib import Path
 # Add parent directory to path to import app modules
 sys.path.append(str(Path(__file__).parent.parent))
 
-from app.workers.celery_app import celery_app
 from app.utils.logger import get_logger
 
 logger = get_logger("celery_worker")
 
 if __name__ == "__main__":
+    # Celery is only loaded when the worker is actually started
+    from app.workers.celery_app import celery_app
+    
     logger.info("Starting Celery worker")
-    sys.argv = ["celery", "worker", "--loglevel=info"]
+    # worker_main takes the arguments after the program name; the app is
+    # passed directly so no -A is needed.
+    # -Ofair hands tasks only to idle processes and gossip/mingle/heartbeat
+    # are cluster chatter this deployment doesn't use
+    sys.argv = [
+        "worker",
+        "--loglevel=info",
+        "-Ofair",
+        "--prefetch-multiplier=1",
+        "--without-gossip",
+        "--without-mingle",
+        "--without-heartbeat",
+    ]
     celery_app.worker_main(sys.argv)
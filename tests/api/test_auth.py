@@ -5,6 +5,12 @@ import pytest
 from fastapi.testclient import TestClient
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
+from werkzeug.security import generate_password_hash
+from datetime import timedelta
+from unittest.mock import patch
+from fastapi import HTTPException
+
+from app.utils import auth
 
 from tests.utils.helpers import create_test_user
 
@@ -42,6 +48,39 @@ async def test_login(client: TestClient, db: AsyncSession):
     assert data["token_type"] == "bearer"
 
 
+@pytest.mark.asyncio
+async def test_login_token_authenticates(client: TestClient, db: AsyncSession):
+    """
+    Test that a token issued by the login endpoint is accepted by protected routes.
+    """
+    # Arrange
+    email = "testlogin@example.com"
+    password = "password123"
+    username = "testlogin"
+    
+    await create_test_user(
+        db,
+        email=email,
+        password=password,
+        username=username
+    )
+    
+    token = client.post(
+        "/api/v1/auth/token",
+        data={"username": username, "password": password}
+    ).json()["access_token"]
+    
+    # Act
+    response = client.get(
+        "/api/v1/users/me",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["username"] == username
+
+
 @pytest.mark.asyncio
 async def test_login_wrong_password(client: TestClient, db: AsyncSession):
     """
@@ -71,6 +110,37 @@ async def test_login_wrong_password(client: TestClient, db: AsyncSession):
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.asyncio
+async def test_login_legacy_password_hash(client: TestClient, db: AsyncSession):
+    """
+    Test login for a user whose password was hashed with Werkzeug.
+    """
+    # Arrange
+    email = "legacy@example.com"
+    password = "password123"
+    username = "legacy"
+    
+    user = await create_test_user(
+        db,
+        email=email,
+        password=password,
+        username=username
+    )
+    user.hashed_password = generate_password_hash(password)
+    await db.commit()
+    
+    login_data = {"username": username, "password": password}
+    
+    # Act
+    response = client.post(
+        "/api/v1/auth/token",
+        data=login_data
+    )
+    
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+
+
 @pytest.mark.asyncio
 async def test_login_inactive_user(client: TestClient, db: AsyncSession):
     """
@@ -153,3 +223,56 @@ async def test_register_existing_user(client: TestClient, db: AsyncSession):
     
     # Assert
     assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_decode_token_caches_verified_payload():
+    """
+    Test that a verified token is decoded once and never served past its expiry.
+    """
+    # Arrange
+    token = auth.create_access_token({"sub": "cached-token"}, expires_delta=timedelta(minutes=5))
+    
+    # Act
+    with patch.object(auth.jwt, "decode", wraps=auth.jwt.decode) as decode:
+        first = auth.decode_token(token)
+        second = auth.decode_token(token)
+    
+    # Assert
+    assert first == second
+    assert first["sub"] == "cached-token"
+    decode.assert_called_once()
+    
+    # Past "exp" the cached payload is dropped and the token rejected
+    with patch.object(auth.time, "time", return_value=first["exp"] + 1), \
+         patch.object(auth.jwt, "decode", side_effect=auth.jwt.ExpiredSignatureError):
+        with pytest.raises(HTTPException) as exc_info:
+            auth.decode_token(token)
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_access_token_with_non_ascii_claims_round_trips():
+    """
+    Test that non-ASCII claims survive the orjson encoder and verify with PyJWT.
+    
+    The payload is raw UTF-8 rather than PyJWT's \\uXXXX escapes, so the token
+    isn't byte-identical to jwt.encode's, but the claims are.
+    """
+    # Arrange
+    claims = {"sub": "nguyễn_văn_ân", "user_id": 7}
+    
+    # Act
+    token = auth.create_access_token(claims, expires_delta=timedelta(minutes=5))
+    payload = auth.jwt.decode(
+        token,
+        auth.settings.JWT_SECRET_KEY,
+        algorithms=[auth.settings.JWT_ALGORITHM]
+    )
+    
+    # Assert
+    assert payload["sub"] == claims["sub"]
+    assert payload["user_id"] == claims["user_id"]
+    assert token != auth.jwt.encode(
+        payload,
+        auth.settings.JWT_SECRET_KEY,
+        algorithm=auth.settings.JWT_ALGORITHM
+    )
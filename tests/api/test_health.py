@@ -1,10 +1,18 @@
 """
 Tests for health endpoints.
 """
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from fastapi import status
 
+from app.config.settings import settings
+from app.controllers import health_controller
+from app.controllers.health_controller import DatabaseProbe
+
 
 def test_health_check(client: TestClient):
     """
@@ -17,6 +25,15 @@ def test_health_check(client: TestClient):
     assert data["message"] == "Service is running"
 
 
+async def test_health_check_async(async_client: httpx.AsyncClient):
+    """
+    Test the health check endpoint through the async client.
+    """
+    response = await async_client.get("/health")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "ok"
+
+
 def test_db_health_check(client: TestClient):
     """
     Test the database health check endpoint.
@@ -26,3 +43,59 @@ def test_db_health_check(client: TestClient):
     data = response.json()
     assert data["status"] == "ok"
     assert data["message"] == "Database connection is healthy"
+
+
+def test_trace_headers(client: TestClient):
+    """
+    Test that the logging middleware stamps tracing headers on responses.
+    """
+    response = client.get("/api/v1/users/me", headers={"X-Request-ID": "test-request-id"})
+    assert response.headers["X-Request-ID"] == "test-request-id"
+    assert "X-Process-Time" in response.headers
+
+
+def test_health_check_skips_logging_middleware(client: TestClient):
+    """
+    Test that health probes bypass the logging middleware.
+    """
+    response = client.get("/health")
+    assert response.status_code == status.HTTP_200_OK
+    assert "X-Process-Time" not in response.headers
+
+
+async def test_db_probe_failure_expires_after_ttl():
+    """
+    Test that a failed probe is reused within HEALTH_DB_CACHE_TTL and the
+    database is probed again once it passes.
+    """
+    # Arrange
+    probe = DatabaseProbe()
+    failing_db = MagicMock()
+    failing_db.execute = AsyncMock(side_effect=OSError("connection refused"))
+    healthy_db = MagicMock()
+    healthy_db.execute = AsyncMock()
+
+    # Act / Assert: the failure is cached
+    assert await probe.check(failing_db) == "connection refused"
+    assert await probe.check(healthy_db) == "connection refused"
+    healthy_db.execute.assert_not_awaited()
+
+    # Act / Assert: after the TTL the next call reprobes
+    later = time.monotonic() + settings.HEALTH_DB_CACHE_TTL + 1
+    with patch("app.controllers.health_controller.time.monotonic", return_value=later):
+        assert await probe.check(healthy_db) is None
+    healthy_db.execute.assert_awaited_once()
+
+
+def test_db_health_check_reports_cached_failure(client: TestClient):
+    """
+    Test that /health/db answers 503 with the probe's error.
+    """
+    probe = DatabaseProbe()
+    probe.check = AsyncMock(return_value="connection refused")
+
+    with patch.object(health_controller, "db_probe", probe):
+        response = client.get("/health/db")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "connection refused" in response.json()["detail"]
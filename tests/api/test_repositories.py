@@ -0,0 +1,190 @@
+"""
+Tests for the shared repository layer.
+"""
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config.settings import settings
+from app.models.user import User
+from app.repositories import base_repository
+from app.repositories import user_repository as user_repository_module
+from app.repositories.user_repository import user_repository
+from tests.utils.helpers import create_test_user
+
+
+@pytest.mark.asyncio
+async def test_get_all_filters_none_as_is_null(db: AsyncSession):
+    """
+    Test that filter_by values of None match NULL columns, like count() does.
+    """
+    # Arrange
+    user = await create_test_user(
+        db,
+        email="nullphone@example.com",
+        password="password123"
+    )
+    filter_by = {"username": user.username, "phone": None}
+
+    # Act
+    users = await user_repository.get_all(db, filter_by=filter_by)
+    page, total = await user_repository.get_page(db, filter_by=filter_by)
+    count = await user_repository.count(db, filter_by=filter_by)
+
+    # Assert
+    assert [u.id for u in users] == [user.id]
+    assert [u.id for u in page] == [user.id]
+    assert total == count == 1
+
+
+
+@pytest.mark.asyncio
+async def test_create_many_keeps_order_and_defaults_across_chunks(db: AsyncSession):
+    """
+    Test bulk creation across several INSERT chunks.
+    """
+    # Arrange
+    rows = [
+        {"username": f"bulk{i}", "email": f"bulk{i}@example.com", "hashed_password": "x"}
+        for i in range(5)
+    ]
+
+    # Act
+    with patch.object(base_repository, "BULK_INSERT_CHUNK_SIZE", 2):
+        users = await user_repository.create_many(db, objs_in=rows)
+
+    # Assert
+    assert [u.username for u in users] == [row["username"] for row in rows]
+    assert len({u.id for u in users}) == len(rows)
+    assert all(u.is_active is True and u.created_at is not None for u in users)
+    assert await user_repository.count(db, filter_by={"email": rows[-1]["email"]}) == 1
+
+def _settings_with(**overrides):
+    """Copy of the (frozen) settings with some values replaced"""
+    return settings.model_copy(update=overrides)
+
+
+def _fake_session(dialect_name: str, *scalars):
+    """Session stub whose execute() returns the given scalars in order"""
+    results = []
+    for value in scalars:
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = value
+        result.scalar_one.return_value = value
+        results.append(result)
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = dialect_name
+    session.execute = AsyncMock(side_effect=results)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_count_estimates_unfiltered_postgres_count():
+    """
+    Test that DB_EXACT_COUNT=False reads the pg_class estimate on PostgreSQL.
+    """
+    session = _fake_session("postgresql", 42)
+
+    with patch("app.repositories.base_repository.settings", _settings_with(DB_EXACT_COUNT=False)):
+        assert await user_repository.count(session) == 42
+
+    stmt, params = session.execute.call_args.args
+    assert "to_regclass" in str(stmt)
+    assert params == {"table_name": "users"}
+
+
+@pytest.mark.asyncio
+async def test_count_falls_back_when_table_has_no_statistics():
+    """
+    Test that a reltuples of -1 (never analyzed) falls back to an exact count.
+    """
+    session = _fake_session("postgresql", -1, 7)
+
+    with patch("app.repositories.base_repository.settings", _settings_with(DB_EXACT_COUNT=False)):
+        assert await user_repository.count(session) == 7
+
+    assert session.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_count_is_exact_on_other_dialects(db: AsyncSession):
+    """
+    Test that the estimate is never used outside PostgreSQL.
+    """
+    exact = await user_repository.count(db)
+
+    with patch("app.repositories.base_repository.settings", _settings_with(DB_EXACT_COUNT=False)):
+        assert await user_repository.count(db) == exact
+
+
+@pytest.mark.asyncio
+async def test_user_lookup_cache_hit_invalidation_and_expiry(db: AsyncSession):
+    """
+    Test that email lookups are cached, dropped on update and expire after the TTL.
+    """
+    # Arrange
+    user = await create_test_user(
+        db,
+        email="cached@example.com",
+        password="password123"
+    )
+    await user_repository.get_by_email(db, "cached@example.com")
+
+    # Act / Assert: a repeat lookup (any case) only re-reads the account columns
+    with patch.object(db, "execute", wraps=db.execute) as execute:
+        hit = await user_repository.get_by_email(db, "Cached@Example.com")
+    assert hit.id == user.id
+    assert execute.call_args.args[0] is user_repository_module._GET_ACCOUNT_STMT
+    execute.assert_called_once()
+
+    # Act / Assert: an update invalidates the entry
+    await user_repository.update(db, db_obj=hit, obj_in={"full_name": "Renamed"})
+    with patch.object(db, "execute", wraps=db.execute) as execute:
+        refreshed = await user_repository.get_by_email(db, "cached@example.com")
+    assert refreshed.full_name == "Renamed"
+    assert execute.call_args.args[0] is user_repository_module._GET_BY_EMAIL_STMT
+
+    # Act / Assert: entries expire after USER_CACHE_TTL
+    later = time.monotonic() + settings.USER_CACHE_TTL + 1
+    with patch("app.repositories.user_repository.time.monotonic", return_value=later):
+        with patch.object(db, "execute", wraps=db.execute) as execute:
+            await user_repository.get_by_email(db, "cached@example.com")
+    assert execute.call_args.args[0] is user_repository_module._GET_BY_EMAIL_STMT
+
+
+@pytest.mark.asyncio
+async def test_cached_lookup_sees_account_changes_made_elsewhere(db: AsyncSession):
+    """
+    Test that password, status and rename writes that bypass the repository
+    (another worker, a script, raw SQL) apply to cached users at once.
+    """
+    # Arrange
+    user = await create_test_user(
+        db,
+        email="elsewhere@example.com",
+        password="password123"
+    )
+    await user_repository.get_by_username(db, user.username)
+
+    # Act: change the account without going through the repository
+    await db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(hashed_password="new-hash", is_active=False, is_superuser=True)
+    )
+    await db.commit()
+    cached = await user_repository.get_by_username(db, user.username)
+
+    # Assert
+    assert cached.hashed_password == "new-hash"
+    assert cached.is_active is False
+    assert cached.is_superuser is True
+
+    # Act / Assert: after a rename the old username no longer resolves
+    old_username = user.username
+    await db.execute(update(User).where(User.id == user.id).values(username="renamed_elsewhere"))
+    await db.commit()
+    assert await user_repository.get_by_username(db, old_username) is None
@@ -1,7 +1,13 @@
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import io
+import threading
+
+from starlette.datastructures import Headers, UploadFile
+
+# The S3 service modules (and boto3) are imported inside the tests that use
+# them, so collecting this file doesn't load them
 
 def test_upload_image_success(client: TestClient, auth_headers: dict):
     """Test successful image upload"""
@@ -40,11 +46,38 @@ def test_upload_invalid_file_type(client: TestClient, auth_headers: dict):
     assert response.status_code == 400
     assert "Only image files are allowed" in response.json()["detail"]
 
+class _ZeroFile(io.RawIOBase):
+    """Seekable stream of zero bytes that reports its size without allocating it"""
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._pos = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def tell(self):
+        return self._pos
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+    
+    def readinto(self, buffer):
+        n = max(0, min(len(buffer), self._size - self._pos))
+        buffer[:n] = bytes(n)
+        self._pos += n
+        return n
+
 def test_upload_file_too_large(client: TestClient, auth_headers: dict):
     """Test upload with file too large"""
-    # Create a large fake file (11MB)
-    large_content = b"x" * (11 * 1024 * 1024)
-    large_file = io.BytesIO(large_content)
+    # An 11MB file by size only: the declared Content-Length is rejected
+    # before the body is read, so its bytes are never produced
+    large_file = _ZeroFile(11 * 1024 * 1024)
     
     response = client.post(
         "/api/v1/upload/image",
@@ -52,8 +85,8 @@ def test_upload_file_too_large(client: TestClient, auth_headers: dict):
         headers=auth_headers
     )
     
-    assert response.status_code == 400
-    assert "File size cannot exceed" in response.json()["detail"]
+    assert response.status_code == 413
+    assert "cannot exceed" in response.json()["detail"]
 
 def test_upload_empty_file(client: TestClient, auth_headers: dict):
     """Test upload with empty file"""
@@ -124,3 +157,168 @@ def test_unauthorized_get_url(client: TestClient):
     """Test unauthorized URL generation attempt"""
     response = client.get("/api/v1/upload/url/uploads/test.jpg")
     assert response.status_code == 401
+
+
+async def test_ensure_bucket_retries_after_connection_error():
+    """Test that an unreachable S3 endpoint doesn't mark the bucket ready"""
+    from botocore.exceptions import EndpointConnectionError
+    from app.services.s3_service import S3Service
+    
+    service = S3Service()
+    
+    with patch.object(
+        service.s3_client, "head_bucket",
+        side_effect=EndpointConnectionError(endpoint_url="http://localhost:4566")
+    ):
+        assert await service.ensure_bucket() is False
+    
+    with patch.object(service.s3_client, "head_bucket") as mock_head:
+        assert await service.ensure_bucket() is True
+        assert await service.ensure_bucket() is True
+    
+    # Checked once, then served from the flag
+    assert mock_head.call_count == 1
+
+
+
+def test_presigned_url_cache_hit_and_expiry():
+    """Test that presigned URLs are reused until the cache margin and report their remaining lifetime"""
+    from app.services.s3_service import S3Service
+    
+    service = S3Service()
+    urls = iter(["https://signed/1", "https://signed/2"])
+    
+    # Relies on the default S3_PRESIGNED_URL_CACHE_MARGIN of 600 seconds
+    with patch.object(service.s3_client, "generate_presigned_url", side_effect=lambda *a, **kw: next(urls)), \
+         patch("app.services.s3_service.time.monotonic") as mock_clock:
+        
+        mock_clock.return_value = 1000.0
+        assert service.generate_presigned_url("tmp/a.jpg", 3600) == "https://signed/1"
+        assert service.presigned_url_expires_in("tmp/a.jpg", 3600) == 3600
+        
+        # Reused while more than the margin is left, with the real remaining time
+        mock_clock.return_value = 1000.0 + 2000
+        assert service.generate_presigned_url("tmp/a.jpg", 3600) == "https://signed/1"
+        assert service.presigned_url_expires_in("tmp/a.jpg", 3600) == 1600
+        
+        # Re-signed once less than the margin would be left
+        mock_clock.return_value = 1000.0 + 3000
+        assert service.generate_presigned_url("tmp/a.jpg", 3600) == "https://signed/2"
+        assert service.presigned_url_expires_in("tmp/a.jpg", 3600) == 3600
+
+
+def test_presigned_url_cache_evicts_oldest():
+    """Test that the presigned URL cache drops its oldest entry when full"""
+    from app.services.s3_service import S3Service
+    
+    service = S3Service()
+    
+    with patch.object(service.s3_client, "generate_presigned_url", side_effect=lambda *a, **kw: kw["Params"]["Key"]), \
+         patch("app.services.s3_service._URL_CACHE_MAXSIZE", 2):
+        
+        for key in ("tmp/a.jpg", "tmp/b.jpg", "tmp/c.jpg"):
+            service.generate_presigned_url(key, 3600)
+    
+    assert [key for key, _ in service._url_cache] == ["tmp/b.jpg", "tmp/c.jpg"]
+
+
+async def test_process_file_upload_streams_spooled_file():
+    """Test that uploads hand the spooled file to S3 without reading it into memory"""
+    from app.services.upload_service import upload_service
+    
+    spooled = io.BytesIO(b"fake image content")
+    spooled.seek(5)
+    file = UploadFile(
+        file=spooled,
+        filename="test_image.jpg",
+        headers=Headers({"content-type": "image/jpeg"})
+    )
+    
+    with patch.object(upload_service.s3_service, "upload_file", AsyncMock(return_value="tmp/test.jpg")) as mock_upload, \
+         patch.object(upload_service.s3_service, "generate_presigned_url", return_value="https://signed/1"), \
+         patch.object(file, "read", AsyncMock(side_effect=AssertionError("file was read into memory"))):
+        response = await upload_service.process_file_upload(file)
+    
+    assert response.file_size == len(b"fake image content")
+    uploaded = mock_upload.call_args.kwargs["file_obj"]
+    assert uploaded is spooled
+    assert uploaded.tell() == 0
+
+
+async def test_upload_file_runs_on_s3_executor():
+    """Test that blocking boto3 uploads run on the dedicated S3 thread pool"""
+    from app.services.s3_service import S3Service
+    
+    service = S3Service()
+    service._bucket_ready = True
+    threads = []
+    
+    with patch.object(
+        service.s3_client, "upload_fileobj",
+        side_effect=lambda *a, **kw: threads.append(threading.current_thread().name)
+    ):
+        file_key = await service.upload_file(io.BytesIO(b"data"), "test.jpg", "image/jpeg")
+    
+    assert file_key.endswith(".jpg")
+    assert threads and threads[0].startswith("s3")
+
+
+def test_oversized_content_length_rejected_before_body(client: TestClient):
+    """Test that a declared Content-Length over the limit gets 413 before auth or parsing"""
+    response = client.post(
+        "/api/v1/upload/image",
+        content=b"x",
+        headers={"Content-Length": str(100 * 1024 * 1024), "Content-Type": "multipart/form-data; boundary=x"}
+    )
+    
+    assert response.status_code == 413
+    assert "cannot exceed" in response.json()["detail"]
+
+
+def _body_size_middleware(client: TestClient):
+    """The app's BodySizeLimitMiddleware instance (the stack is built once the client starts)"""
+    from app.middlewares.body_size_middleware import BodySizeLimitMiddleware
+    
+    node = client.app.middleware_stack
+    while not isinstance(node, BodySizeLimitMiddleware):
+        node = node.app
+    return node
+
+
+def test_oversized_chunked_body_rejected(client: TestClient):
+    """Test that a body without Content-Length is cut off once it passes the limit"""
+    def chunks():
+        for _ in range(3):
+            yield b"x" * 2048
+    
+    # A 4 KiB limit instead of the real one, so the test streams 6 KiB, not 12 MiB
+    with patch.object(_body_size_middleware(client), "max_body_size", 4096):
+        response = client.post(
+            "/api/v1/auth/token",
+            content=chunks(),
+            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        )
+    
+    assert response.status_code == 413
+
+
+def test_oversized_chunked_body_rejected_for_any_body_reader():
+    """Test that the limit answers 413 when something other than FastAPI's parsing reads the body"""
+    from app.middlewares.body_size_middleware import BodySizeLimitMiddleware
+    
+    async def drain_body(scope, receive, send):
+        # Reads the raw stream like Request.stream() or a body-reading middleware
+        while (await receive()).get("more_body"):
+            pass
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    
+    def chunks():
+        for _ in range(3):
+            yield b"x" * 2048
+    
+    raw_client = TestClient(BodySizeLimitMiddleware(drain_body, max_body_size=4096))
+    response = raw_client.post("/stream", content=chunks())
+    
+    assert response.status_code == 413
+    assert "cannot exceed" in response.json()["detail"]
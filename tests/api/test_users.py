@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.utils.auth import create_access_token, get_token_claims
 from tests.utils.helpers import create_test_user, create_test_token_for_user, get_auth_headers
 
 
@@ -39,6 +40,29 @@ async def test_create_user(client: TestClient, db: AsyncSession):
     assert "password" not in data["data"]
 
 
+@pytest.mark.asyncio
+async def test_create_user_duplicate_email(client: TestClient, db: AsyncSession):
+    """
+    Test that creating a user with a taken email (in any case) is rejected.
+    """
+    # Arrange
+    user_data = {
+        "username": "dupemail",
+        "email": "dupemail@example.com",
+        "password": "password123",
+        "password_confirm": "password123"
+    }
+    client.post("/api/v1/users/", json=user_data)
+    duplicate_data = {**user_data, "username": "dupemail2", "email": "DupEmail@example.com"}
+
+    # Act
+    response = client.post("/api/v1/users/", json=duplicate_data)
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "already exists" in response.json()["detail"]
+
+
 @pytest.mark.asyncio
 async def test_get_users_unauthorized(client: TestClient, db: AsyncSession):
     """
@@ -82,69 +106,103 @@ async def test_get_users_authenticated(client: TestClient, db: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_get_user_by_id(client: TestClient, db: AsyncSession):
+async def test_get_users_pagination(client: TestClient, shared_auth_headers: dict):
     """
-    Test getting a user by ID.
+    Test that the users list reports the total alongside a partial page.
     """
-    # Arrange
-    user = await create_test_user(
-        db,
-        email="testuser@example.com",
-        password="password123"
-    )
+    # Act
+    response = client.get("/api/v1/users/?skip=0&limit=1", headers=shared_auth_headers)
+    past_end = client.get("/api/v1/users/?skip=1000&limit=1", headers=shared_auth_headers)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data["data"]) == 1
+    assert data["total"] >= 1
+    assert data["pages"] == data["total"]
+    assert past_end.json()["data"] == []
+    assert past_end.json()["total"] == data["total"]
 
-    token = create_test_token_for_user(user)
-    auth_headers = get_auth_headers(token)
 
+@pytest.mark.asyncio
+async def test_get_user_by_id(client: TestClient, shared_user, shared_auth_headers: dict):
+    """
+    Test getting a user by ID.
+    """
     # Act
-    response = client.get(f"/api/v1/users/{user.id}", headers=auth_headers)
+    response = client.get(f"/api/v1/users/{shared_user.id}", headers=shared_auth_headers)
 
     # Assert
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert "data" in data
-    assert data["data"]["id"] == user.id
-    assert data["data"]["email"] == user.email
+    assert data["data"]["id"] == shared_user.id
+    assert data["data"]["email"] == shared_user.email
 
 
 @pytest.mark.asyncio
-async def test_get_user_not_found(client: TestClient, db: AsyncSession):
+async def test_get_user_by_id_with_identity_claims(client: TestClient, shared_user):
     """
-    Test getting a non-existent user.
+    Test getting a user by ID with a token carrying the user_id claim.
+    """
+    # Arrange
+    token = create_access_token(get_token_claims(shared_user))
+    auth_headers = get_auth_headers(token)
+
+    # Act
+    response = client.get(f"/api/v1/users/{shared_user.id}", headers=auth_headers)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["data"]["id"] == shared_user.id
+
+
+@pytest.mark.asyncio
+async def test_get_users_rejects_deactivated_user_token(client: TestClient, db: AsyncSession):
+    """
+    Test that a claims token stops working once its user is deactivated.
     """
     # Arrange
     user = await create_test_user(
         db,
-        email="testuser@example.com",
+        email="deactivated@example.com",
         password="password123"
     )
 
-    token = create_test_token_for_user(user)
+    token = create_access_token(get_token_claims(user))
     auth_headers = get_auth_headers(token)
+
+    user.is_active = False
+    await db.commit()
+
+    # Act
+    response = client.get("/api/v1/users/", headers=auth_headers)
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_user_not_found(client: TestClient, shared_auth_headers: dict):
+    """
+    Test getting a non-existent user.
+    """
+    # Arrange
     non_existent_id = 999999
 
     # Act
-    response = client.get(f"/api/v1/users/{non_existent_id}", headers=auth_headers)
+    response = client.get(f"/api/v1/users/{non_existent_id}", headers=shared_auth_headers)
 
     # Assert
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
 @pytest.mark.asyncio
-async def test_update_user(client: TestClient, db: AsyncSession):
+async def test_update_user(client: TestClient, shared_user, shared_auth_headers: dict):
     """
     Test updating a user.
     """
     # Arrange
-    user = await create_test_user(
-        db,
-        email="testuser@example.com",
-        password="password123"
-    )
-
-    token = create_test_token_for_user(user)
-    auth_headers = get_auth_headers(token)
-
     update_data = {
         "full_name": "Updated Name",
         "email": "updated@example.com"
@@ -152,9 +210,9 @@ async def test_update_user(client: TestClient, db: AsyncSession):
 
     # Act
     response = client.put(
-        f"/api/v1/users/{user.id}",
+        f"/api/v1/users/{shared_user.id}",
         json=update_data,
-        headers=auth_headers
+        headers=shared_auth_headers
     )
 
     # Assert
@@ -166,26 +224,46 @@ async def test_update_user(client: TestClient, db: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_me_endpoint(client: TestClient, db: AsyncSession):
+async def test_delete_user(client: TestClient, db: AsyncSession):
     """
-    Test the /me endpoint.
+    Test deleting a user as a superuser, then deleting it again.
     """
     # Arrange
+    admin = await create_test_user(
+        db,
+        email="admin@example.com",
+        password="password123",
+        is_admin=True
+    )
     user = await create_test_user(
         db,
-        email="testuser_me@example.com",
+        email="deleteme@example.com",
         password="password123"
     )
 
-    token = create_test_token_for_user(user)
+    token = create_test_token_for_user(admin)
     auth_headers = get_auth_headers(token)
 
     # Act
-    response = client.get("/api/v1/users/me", headers=auth_headers)
+    response = client.delete(f"/api/v1/users/{user.id}", headers=auth_headers)
+    repeat_response = client.delete(f"/api/v1/users/{user.id}", headers=auth_headers)
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert repeat_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_me_endpoint(client: TestClient, shared_user, shared_auth_headers: dict):
+    """
+    Test the /me endpoint.
+    """
+    # Act
+    response = client.get("/api/v1/users/me", headers=shared_auth_headers)
 
     # Assert
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert "data" in data
-    assert data["data"]["id"] == user.id
-    assert data["data"]["email"] == user.email
+    assert data["data"]["id"] == shared_user.id
+    assert data["data"]["email"] == shared_user.email
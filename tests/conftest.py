@@ -1,16 +1,18 @@
 """
 Test configuration and fixtures for the FastAPI application.
 """
-import asyncio
 import os
-from typing import AsyncGenerator, Generator
+from typing import AsyncGenerator, Dict, Generator
 
 import pytest
 import pytest_asyncio
+from pytest_asyncio import is_async_test
 from fastapi import FastAPI
 import httpx
 from fastapi.testclient import TestClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event
+from sqlalchemy.schema import CreateIndex, CreateTable, DropTable
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 # Set the environment to test
@@ -18,13 +20,17 @@ os.environ["APP_ENV"] = "test"
 
 # Import after setting APP_ENV
 from app.config.database import get_db, Base, engine
-from app.config.settings import settings
 from main import app as application
 
 # Import all models to ensure they're registered with SQLAlchemy metadata
-from tests.utils.models import *  # This is critical for table creation
+from tests.utils.models import BaseModel, User  # This is critical for table creation
 
-# Create session factory using the shared engine
+from app.repositories.user_repository import user_repository
+from tests.utils.helpers import create_test_token_for_user, create_test_user, get_auth_headers
+
+# Create session factory using the shared engine. Both are built once per
+# process (one per xdist worker): conftest and app.config.database are
+# imported once and cached in sys.modules
 TestingSessionLocal = sessionmaker(
     engine, 
     class_=AsyncSession, 
@@ -34,56 +40,133 @@ TestingSessionLocal = sessionmaker(
 )
 
 
+# pysqlite (which aiosqlite wraps) manages transactions itself and breaks
+# SAVEPOINT; let SQLAlchemy emit BEGIN so nested transactions work
+@event.listens_for(engine.sync_engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine.sync_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+def _session_for(connection: AsyncConnection) -> AsyncSession:
+    """
+    Session on the test's connection whose commits only release a SAVEPOINT
+    """
+    return AsyncSession(
+        bind=connection,
+        expire_on_commit=False,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
 @pytest_asyncio.fixture
-async def db() -> AsyncGenerator[AsyncSession, None]:
+async def db_connection() -> AsyncGenerator[AsyncConnection, None]:
     """
-    Provide a database session for tests.
-    Uses the tables created by setup_test_db.
+    Provide one connection per test inside a transaction that is rolled back
+    afterwards, so rows written by a test (or the app it calls) never persist.
     """
-    # Create session using the existing database with tables already created
-    async with TestingSessionLocal() as session:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
         try:
-            yield session
-        except Exception:
-            # Roll back in case of error
-            await session.rollback()
-            raise
+            yield connection
         finally:
-            # Close the session
-            await session.close()
+            await transaction.rollback()
+            # Rolled-back users must not be served from the lookup cache
+            user_repository._cache.clear()
 
 
-@pytest.fixture
-def event_loop() -> Generator:
+@pytest_asyncio.fixture
+async def db(db_connection: AsyncConnection) -> AsyncGenerator[AsyncSession, None]:
     """
-    Create an instance of the default event loop for each test case.
+    Provide a database session for tests.
+    Uses the tables created by setup_test_db; commits become SAVEPOINTs.
     """
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+    async with _session_for(db_connection) as session:
+        yield session
 
 
-async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+@pytest_asyncio.fixture(scope="session")
+async def shared_user(setup_test_db) -> AsyncGenerator[User, None]:
     """
-    Return the test database instead of the production database.
+    Provide one committed user for the whole test run, deleted afterwards.
+    Tests may still modify it: their writes are rolled back as usual.
+    Depends on setup_test_db so it's deleted before the engine is disposed,
+    which drops the in-memory database.
+    
+    Session rather than module scope: pytest-asyncio 0.23 can't resolve the
+    event loop of module-scoped async fixtures defined in conftest.py.
     """
     async with TestingSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        user = await create_test_user(
+            session,
+            email="shared_user@example.com",
+            password="password123"
+        )
+        yield user
+        await session.delete(user)
+        await session.commit()
+
+
+@pytest.fixture(scope="session")
+def shared_auth_headers(shared_user: User) -> Dict[str, str]:
+    """
+    Provide Bearer headers for shared_user, built once per run.
+    """
+    return get_auth_headers(create_test_token_for_user(shared_user))
+
+
+def pytest_collection_modifyitems(items):
+    """
+    Run every async test in the session's event loop (asyncio_mode = auto
+    in pytest.ini), so loop-bound state such as pooled connections is reused
+    between tests instead of rebuilt with a fresh loop each time.
+    """
+    session_loop = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop, append=False)
 
 
 @pytest.fixture
-def app() -> FastAPI:
+def app(db_connection: AsyncConnection) -> FastAPI:
     """
     Create a fresh app instance for testing.
     """
+    async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
+        """
+        Return a session on the test's connection, so the app sees the
+        test's rows and its writes are rolled back with them.
+        """
+        async with _session_for(db_connection) as session:
+            yield session
+
     # Replace the production database dependency with the test database
     application.dependency_overrides[get_db] = override_get_db
     return application
 
 
+def _schema_script() -> str:
+    """
+    Compile the drop-and-create DDL for every model into one script.
+    
+    Returns:
+        Semicolon-separated statements, equivalent to drop_all + create_all
+    """
+    tables = Base.metadata.sorted_tables
+    statements = [DropTable(table, if_exists=True) for table in reversed(tables)]
+    for table in tables:
+        statements.append(CreateTable(table))
+        statements.extend(CreateIndex(index) for index in table.indexes)
+    return ";\n".join(
+        str(statement.compile(dialect=engine.dialect)).strip() for statement in statements
+    ) + ";"
+
+
 @pytest_asyncio.fixture(scope="session", autouse=True)
 async def setup_test_db():
     """
@@ -91,37 +174,49 @@ async def setup_test_db():
     Creates tables and prepares the test database.
     This replaces the need for Alembic migrations in the test environment.
     """
-    # Import all models to ensure they're properly registered with Base.metadata
-    from app.models.user import User
-    from app.models.base_model import BaseModel
-    # Import any other models here
-    
-    # Log that we're setting up the test database
-    print("\nSetting up test database and creating all tables...")
+    # Models are registered with Base.metadata by the imports at the top
+    debug = bool(os.environ.get("PYTEST_DEBUG_DB"))
+    if debug:
+        print("\nSetting up test database and creating all tables...")
     
-    # Create all tables at the beginning of the test session
-    async with engine.begin() as conn:
-        # Drop all tables first to ensure a clean state
-        await conn.run_sync(Base.metadata.drop_all)
-        # Create all tables based on the imported models
-        await conn.run_sync(Base.metadata.create_all)
-        print(f"Created tables: {', '.join(Base.metadata.tables.keys())}")
+    # Recreate the schema in one round trip instead of a DROP and CREATE
+    # per table. APP_ENV=test always uses in-memory SQLite, whose execute()
+    # runs one statement only; executescript takes the whole script
+    script = _schema_script()
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.executescript(script)
+        if debug:
+            print(f"Created tables: {', '.join(Base.metadata.tables.keys())}")
     
     yield
     
-    # Clean up after all tests are done
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
+    # Close this worker's pooled connections in the loop that opened them,
+    # rather than leaving them to interpreter shutdown
+    await engine.dispose()
 
 
-@pytest.fixture
-def client(app: FastAPI) -> Generator:
+@pytest.fixture(scope="session")
+def session_client() -> Generator:
     """
-    Create a test client for the app.
+    Create one test client for the whole run, so the app's lifespan
+    (startup/shutdown) runs once instead of around every test.
     """
+    overrides = dict(application.dependency_overrides)
     # Using TestClient for synchronous testing
-    with TestClient(app, base_url="http://test") as client:
+    with TestClient(application, base_url="http://test") as client:
         yield client
+    application.dependency_overrides = overrides
+
+
+@pytest.fixture
+def client(app: FastAPI, session_client: TestClient) -> TestClient:
+    """
+    Provide the shared test client; app has pointed get_db at this test's
+    connection, and cookies from earlier tests are dropped.
+    """
+    session_client.cookies.clear()
+    return session_client
 
 
 @pytest_asyncio.fixture
@@ -130,5 +225,8 @@ async def async_client(app: FastAPI) -> AsyncGenerator:
     Create an async test client for the app.
     """
     # Using httpx.AsyncClient for async testing
-    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+    # Requests go straight to the app through ASGITransport (the app=
+    # shortcut is deprecated in httpx)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
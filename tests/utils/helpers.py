@@ -2,7 +2,8 @@
 Utility functions for testing.
 """
 import json
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
 from typing import Any, Dict, Optional
 
 import jwt
@@ -28,26 +29,11 @@ async def create_test_user(
     """
     Create a test user in the database.
     """
-    from app.repositories.user_repository import user_repository
-    from sqlalchemy import select
-    from sqlalchemy.ext.asyncio import AsyncSession
-    
     # Generate username from email if not provided
     if username is None:
         username = email.split('@')[0]
     
-    # Check if user already exists using direct query to ensure tables exist
-    try:
-        result = await db.execute(select(User).filter(User.email == email))
-        existing_user = result.scalar_one_or_none()
-        
-        if existing_user:
-            return existing_user
-    except Exception as e:
-        # If there's an error, log it and continue to create a new user
-        print(f"Error checking for existing user: {str(e)}")
-        # This likely means the table doesn't exist yet
-        
+    # Each test runs in a rolled-back transaction, so the user can't exist yet
     # Create a new user
     # The User constructor expects username, email, password, full_name, is_superuser
     # is_active is set after construction
@@ -66,6 +52,24 @@ async def create_test_user(
     return user
 
 
+def _expiry(expires_delta: Optional[timedelta]) -> int:
+    """
+    Token expiry as a Unix timestamp (whole seconds, like the "exp" claim).
+    """
+    return int(time.time() + (expires_delta or timedelta(minutes=15)).total_seconds())
+
+
+def _encode_token(sub: str, exp: int) -> str:
+    """
+    Sign a test JWT for the given subject and expiry.
+    """
+    return jwt.encode(
+        {"sub": sub, "exp": exp},
+        settings.JWT_SECRET_KEY,
+        algorithm=settings.JWT_ALGORITHM
+    )
+
+
 def create_test_token(user_id: int, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a test JWT token for a user.
@@ -73,43 +77,24 @@ def create_test_token(user_id: int, expires_delta: Optional[timedelta] = None) -
     # For backward compatibility, we'll use a default username
     # This function should be used with create_test_token_for_user instead
     username = f"testuser_{user_id}"
-    
-    to_encode = {"sub": username}
-    
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-        
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.JWT_SECRET_KEY, 
-        algorithm=settings.JWT_ALGORITHM
-    )
-    
-    return encoded_jwt
+    return _encode_token(username, _expiry(expires_delta))
 
 
 def create_test_token_for_user(user, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a test JWT token for a user object.
-    """
-    to_encode = {"sub": user.username}
     
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-        
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, 
-        settings.JWT_SECRET_KEY, 
-        algorithm=settings.JWT_ALGORITHM
-    )
+    Default-expiry tokens are signed once per user object and reused.
+    """
+    if expires_delta is not None:
+        return _encode_token(user.username, _expiry(expires_delta))
     
-    return encoded_jwt
+    cached = getattr(user, "_test_token", None)
+    # The username may have changed since the token was signed
+    if cached is None or cached[0] != user.username:
+        cached = (user.username, _encode_token(user.username, _expiry(None)))
+        user._test_token = cached
+    return cached[1]
 
 
 def get_auth_headers(token: str) -> Dict[str, str]: